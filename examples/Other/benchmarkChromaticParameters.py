@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Time spent in the evaluation of chromatic parameters on the
+ASPRO_MATISSE_CHROMATIC_BINARY example data with and without their
+computation on the unique wavelengths and times
+"""
+import time
+from pathlib import Path
+
+import numpy as np
+
+import oimodeler as oim
+
+path = Path(__file__).parent.parent.parent
+data_dir = path / "data" / "ASPRO_MATISSE_CHROMATIC_BINARY"
+files = list(data_dir.glob("*.fits"))
+
+# NOTE: A binary with chromatic fluxes and a chromatic diameter
+ud = oim.oimUD(
+    d=oim.oimInterp("powerlawWl", x0=3.5e-6, A=3, p=1.2),
+    f=oim.oimInterp("tempWl", temp=8000, solid_angle=3),
+)
+eg = oim.oimEGauss(
+    x=10,
+    fwhm=oim.oimInterp("GaussWl", val0=2, value=3, x0=4.05e-6, fwhm=1e-7),
+    elong=1.5,
+    pa=oim.oimInterp(
+        "wl", wl=np.linspace(3e-6, 5e-6, 20), values=np.linspace(10, 50, 20)
+    ),
+    f=oim.oimInterp("mGaussWl", val0=1, values=[2, 3], x0=[3.5e-6, 4.6e-6],
+                    fwhm=[5e-8, 5e-8]),
+)
+model = oim.oimModel(ud, eg)
+sim = oim.oimSimulator(files, model)
+print(
+    f"{sim.data.unique_wl.size} coordinates for "
+    f"{np.unique(sim.data.unique_wl).size} unique wavelengths"
+)
+
+wl, t = sim.data.unique_wl, sim.data.unique_mjd
+params = [
+    param
+    for component in model.components
+    for param in component.params.values()
+    if isinstance(param, oim.oimParamInterpolator)
+]
+
+
+def evaluateParameters():
+    with oim.oimParamEvaluation(wl, t):
+        for param in params:
+            param(wl, t)
+
+
+# NOTE: The temperature of the UD is changed so that no component is cached
+niter = 200
+for uniqueParams in [False, True]:
+    oim.oimOptions.model.uniqueParams = uniqueParams
+
+    start = time.perf_counter()
+    for i in range(niter):
+        evaluateParameters()
+    dtParams = (time.perf_counter() - start) / niter
+
+    start = time.perf_counter()
+    for i in range(niter):
+        ud.params["f"].params[0].value = 8000 + i
+        sim.compute(computeChi2=True)
+    dt = (time.perf_counter() - start) / niter
+    print(
+        f"uniqueParams={uniqueParams}: parameters {dtParams*1e3:.3f} ms, "
+        f"compute {dt*1e3:.3f} ms"
+    )
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling of the oimFitterDynesty fitter with the number of processes on the
+ASPRO_MATISSE example data
+"""
+import os
+import time
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import oimodeler as oim
+
+path = Path(__file__).parent.parent.parent
+data_dir = path / "data" / "ASPRO_MATISSE"
+
+# NOTE: Change this path if you want to save the products at another location
+save_dir = path / "images"
+if not save_dir.exists():
+    save_dir.mkdir(parents=True)
+
+files = list(data_dir.glob("*.fits"))
+
+# NOTE: The number of processes to test (1, 2, 4... up to the number of cores)
+ncores = os.cpu_count()
+nprocs = [2**i for i in range(int(np.log2(ncores)) + 1)]
+if nprocs[-1] != ncores:
+    nprocs.append(ncores)
+
+times = []
+for nproc in nprocs:
+    ud = oim.oimUD(d=3, f=0.5)
+    pt = oim.oimPt(f=1)
+    model = oim.oimModel([ud, pt])
+    ud.params["d"].set(min=0.01, max=20)
+    ud.params["x"].set(min=-50, max=50, free=True)
+    ud.params["y"].set(min=-50, max=50, free=True)
+    ud.params["f"].set(min=0.0, max=10.0)
+    pt.params["f"].free = False
+
+    # NOTE: The same random generator for all runs
+    fit = oim.oimFitterDynesty(files, model, method="static")
+    fit.prepare(nlive=500, nproc=nproc, rstate=np.random.default_rng(1))
+
+    start = time.perf_counter()
+    fit.run(dlogz=0.1)
+    times.append(time.perf_counter() - start)
+    print(
+        f"nproc={nproc:3d}: {times[-1]:8.2f}s speedup={times[0]/times[-1]:.2f}"
+    )
+
+# %%
+fig, ax = plt.subplots()
+ax.plot(nprocs, times[0] / np.array(times), marker="o", label="dynesty")
+ax.plot(nprocs, nprocs, ls="--", color="k", label="linear")
+ax.set_xlabel("Number of processes")
+ax.set_ylabel("Speedup")
+ax.legend()
+fig.savefig(save_dir / "benchmarkDynestyParallel.png")
@@ -10,9 +10,76 @@ import numpy as np
 from scipy.signal import convolve2d
 from scipy.special import gamma, j0, j1, jn, jv
 
-from .oimComponent import oimComponentFourier
+from .oimComponent import _imageGrid, _normalizeImage, oimComponentFourier
+from .oimOptions import oimOptions
 from .oimParam import _standardParameters, oimParam
 
+_besselTables = {}
+
+
+def _besselKernelDirect(nu, xx):
+    """Return j0(xx) for nu=0 and jv(nu, xx) / xx**nu otherwise."""
+    if nu == 0:
+        return j0(xx)
+    if nu == 1:
+        return np.divide(j1(xx), xx)
+    return np.divide(jv(nu, xx), xx**nu)
+
+
+def _getBesselTable(nu):
+    """Return the table of the Bessel kernel of order nu for the current
+    tolerance and xmax options.
+
+    NOTE: From the Poisson integral, the second derivative of the kernel
+    normalized by its value at zero, K(x) / K(0), is bounded by 1 / (2 nu + 2)
+    so that the error of the linear interpolation with a step h is lower than
+    h**2 / (16 (nu + 1)).
+    """
+    options = oimOptions.model.bessel
+    key = (nu, options.tolerance, options.xmax)
+    if key not in _besselTables:
+        k0 = 1 / (2**nu * gamma(nu + 1))
+        step = np.sqrt(16 * (nu + 1) * options.tolerance)
+        x = np.arange(int(np.ceil(options.xmax / step)) + 2) * step
+        values = np.empty_like(x)
+        values[0] = k0
+        values[1:] = _besselKernelDirect(nu, x[1:])
+        _besselTables[key] = (step, x[-2], values[:-1], np.diff(values))
+    return _besselTables[key]
+
+
+def _besselKernelTable(nu, xx):
+    """Linear interpolation of the Bessel kernel of order nu in its table,
+    with a direct computation beyond its range."""
+    step, xmax, values, slopes = _getBesselTable(nu)
+    xx = np.asarray(xx, dtype=float)
+    if xx.ndim == 0:
+        return _besselKernelTable(nu, xx[None])[0]
+
+    inside = (xx >= 0) & (xx < xmax)
+    pos = np.where(inside, xx, 0) / step
+    index = pos.astype(int)
+    res = values[index] + (pos - index) * slopes[index]
+    if not inside.all():
+        res[~inside] = _besselKernelDirect(nu, xx[~inside])
+    return res
+
+
+def _besselKernel(nu, xx):
+    """Return the Bessel kernel j0(xx) for nu=0 and jv(nu, xx) / xx**nu
+    otherwise, as used by the radially symmetric components.
+
+    The unique and table options of oimOptions.model.bessel allow to compute
+    it on the unique values of xx only and to interpolate it in precomputed
+    tables. With tables, its value at xx=0 is the limit instead of NaN.
+    """
+    options = oimOptions.model.bessel
+    function = _besselKernelTable if options.table else _besselKernelDirect
+    if options.unique and np.ndim(xx) != 0:
+        unique, inverse = np.unique(xx, return_inverse=True)
+        return function(nu, unique)[inverse.reshape(np.shape(xx))]
+    return function(nu, xx)
+
 
 class oimPt(oimComponentFourier):
     """Point Source component defined in the fourier space
@@ -29,6 +96,7 @@ class oimPt(oimComponentFourier):
 
     name = "Point source"
     shortname = "Pt"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -69,6 +137,7 @@ class oimBackground(oimComponentFourier):
 
     name = "Background"
     shortname = "Bckg"
+    cacheable = True
 
     def __init__(self, **kwargs):
 
@@ -76,11 +145,7 @@ class oimBackground(oimComponentFourier):
         self._eval(**kwargs)
 
     def _visFunction(self, ucoord, vcoord, rho, wl, t):
-        vc = rho * 0
-        idx = np.where(rho == 0)[0]
-        if np.size(idx) != 0:
-            vc[idx] = 1
-        return vc
+        return np.where(rho == 0, 1.0, 0.0)
 
     def _imageFunction(self, xx, yy, wl, t):
         return xx * 0 + 1
@@ -103,6 +168,7 @@ class oimUD(oimComponentFourier):
 
     name = "Uniform Disk"
     shortname = "UD"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -116,7 +182,7 @@ class oimUD(oimComponentFourier):
             * self.params["d"].unit.to(u.rad)
             * rho
         )
-        return np.nan_to_num(np.divide(2 * j1(xx), xx), nan=1)
+        return np.nan_to_num(2 * _besselKernel(1, xx), nan=1)
 
     def _imageFunction(self, xx, yy, wl, t):
         return (
@@ -146,6 +212,7 @@ class oimEllipse(oimUD):
 
     name = "Uniform Ellipse"
     shortname = "eUD"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -170,6 +237,7 @@ class oimGauss(oimComponentFourier):
 
     name = "Gaussian Disk"
     shortname = "GD"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -217,6 +285,7 @@ class oimEGauss(oimGauss):
 
     name = "Gaussian Ellipse"
     shortname = "EG"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -241,6 +310,7 @@ class oimIRing(oimComponentFourier):
 
     name = "Infinitesimal Ring"
     shortname = "IR"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -254,7 +324,7 @@ class oimIRing(oimComponentFourier):
             * self.params["d"].unit.to(u.rad)
             * rho
         )
-        return j0(xx)
+        return _besselKernel(0, xx)
 
     def _imageFunction(self, xx, yy, wl, t, minPixSize=None):
         r2 = xx**2 + yy**2
@@ -292,6 +362,7 @@ class oimEIRing(oimIRing):
 
     name = "Ellitical Infinitesimal Ring"
     shortname = "EIR"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -318,6 +389,7 @@ class oimRing(oimComponentFourier):
 
     name = "Ring"
     shortname = "R"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -344,7 +416,10 @@ class oimRing(oimComponentFourier):
 
         return np.nan_to_num(
             2
-            * (j1(xxout) / xxout * fout - j1(xxin) / xxin * fin)
+            * (
+                _besselKernel(1, xxout) * fout
+                - _besselKernel(1, xxin) * fin
+            )
             / (fout - fin),
             nan=1,
         )
@@ -377,6 +452,7 @@ class oimRing2(oimComponentFourier):
 
     name = "IRing convolved with UD"
     shortname = "R2"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -391,7 +467,9 @@ class oimRing2(oimComponentFourier):
         xx = np.pi * (d) * rho
         dxx = np.pi * w * rho
 
-        return j0(xx) * np.nan_to_num(np.divide(2 * j1(dxx), dxx), nan=1)
+        return _besselKernel(0, xx) * np.nan_to_num(
+            2 * _besselKernel(1, dxx), nan=1
+        )
 
     def _imageFunction(self, xx, yy, wl, t):
 
@@ -442,6 +520,7 @@ class oimERing(oimRing):
 
     name = "Elliptical Ring"
     shortname = "ER"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -473,6 +552,7 @@ class oimERing2(oimRing2):
 
     name = "Elliptical Ring2"
     shortname = "ER2"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -501,6 +581,7 @@ class oimESKIRing(oimComponentFourier):
 
     name = "Skewed Elliptical Infinitesimal Ring"
     shortname = "SKEIR"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -575,6 +656,7 @@ class oimESKGRing(oimComponentFourier):
 
     name = "Skewed Elliptical Ring"
     shortname = "SKER"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -635,6 +717,7 @@ class oimESKRing(oimComponentFourier):
 
     name = "Skewed Elliptical Ring"
     shortname = "SKER"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -706,6 +789,7 @@ class oimLorentz(oimComponentFourier):
     # TODO : Small difference between images using direct formula or inverse of vis function
     name = "Pseudo Lorentzian"
     shortname = "LZ"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -757,6 +841,7 @@ class oimELorentz(oimLorentz):
 
     name = "Elliptical Pseudo Lorentzian"
     shortname = "ELZ"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -785,6 +870,7 @@ class oimLinearLDD(oimComponentFourier):
 
     name = "Linear Limb Darkened Disk "
     shortname = "LLDD"
+    cacheable = True
 
     # NOTE: From Domiciano de Souza 2003 (phd thesis) and 2021
     # https://www.aanda.org/articles/aa/pdf/2021/10/aa40478-21.pdf
@@ -814,8 +900,8 @@ class oimLinearLDD(oimComponentFourier):
 
         a = self.params["a"](wl, t)
 
-        c1 = 2 * np.divide(j1(xx), xx)
-        c2 = 1.5 * (np.pi * 2) ** 0.5 * np.divide(jv(1.5, xx), xx**1.5)
+        c1 = 2 * _besselKernel(1, xx)
+        c2 = 1.5 * (np.pi * 2) ** 0.5 * _besselKernel(1.5, xx)
         return np.nan_to_num((1 - a) * c1 + a * c2, nan=1)
 
 
@@ -844,6 +930,7 @@ class oimQuadLDD(oimComponentFourier):
     # https://www.aanda.org/articles/aa/pdf/2021/10/aa40478-21.pdf
     name = "Quadratic Limb Darkened Disk "
     shortname = "QLDD"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -878,9 +965,9 @@ class oimQuadLDD(oimComponentFourier):
         a1 = self.params["a1"](wl, t)
         a2 = self.params["a2"](wl, t)
 
-        c1 = np.divide(j1(xx), xx)
-        c2 = (np.pi / 2) ** 0.5 * np.divide(jv(1.5, xx), xx**1.5)
-        c3 = 2 * np.divide(jv(2.0, xx), xx**2.0)
+        c1 = _besselKernel(1, xx)
+        c2 = (np.pi / 2) ** 0.5 * _besselKernel(1.5, xx)
+        c3 = 2 * _besselKernel(2.0, xx)
         s = (6 - 2 * a1 - a2) / 12
         return np.nan_to_num(
             ((1 - a1 - a2) * c1 + (a1 + 2 * a2) * c2 - a2 * c3) / s, nan=1
@@ -910,6 +997,7 @@ class oimPowerLawLDD(oimComponentFourier):
 
     name = "Power Law Limb Darkened Disk "
     shortname = "PLLDD"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -968,6 +1056,7 @@ class oimSqrtLDD(oimComponentFourier):
     # https://www.aanda.org/articles/aa/pdf/2021/10/aa40478-21.pdf
     name = "square-root Limb Darkened Disk "
     shortname = "SLDD"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1002,9 +1091,9 @@ class oimSqrtLDD(oimComponentFourier):
         a1 = self.params["a1"](wl, t)
         a2 = self.params["a2"](wl, t)
 
-        c1 = np.divide(j1(xx), xx)
-        c2 = gamma(5 / 2) * (2 ** (3 / 2)) * np.divide(jv(1.5, xx), xx**1.5)
-        c3 = (gamma(9 / 4)) * (2**1.25) * np.divide(jv(1.25, xx), xx**1.25)
+        c1 = _besselKernel(1, xx)
+        c2 = gamma(5 / 2) * (2 ** (3 / 2)) * _besselKernel(1.5, xx)
+        c3 = (gamma(9 / 4)) * (2**1.25) * _besselKernel(1.25, xx)
         s = (15 - 5 * a1 - 3 * a2) / 30
         return np.nan_to_num(
             ((1 - a1 - a2) * c1 + (2 * a1 / 6) * c2 + (4 * a2 / 10) * c3) / s,
@@ -1042,6 +1131,7 @@ class oim4CLDD(oimComponentFourier):
     # https://www.aanda.org/articles/aa/pdf/2021/10/aa40478-21.pdf
     name = "4 Coefficients Limb Darkened Disk "
     shortname = "4CLDD"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1094,23 +1184,23 @@ class oim4CLDD(oimComponentFourier):
         a3 = self.params["a3"](wl, t)
         a4 = self.params["a4"](wl, t)
 
-        c0 = np.divide(j1(xx), xx)
+        c0 = _besselKernel(1, xx)
         c1 = (
             2
             / 5
             * (gamma(9 / 4))
             * (2**1.25)
-            * np.divide(jv(1.25, xx), xx**1.25)
+            * _besselKernel(1.25, xx)
         )
-        c2 = (np.pi / 2) ** 0.5 * np.divide(jv(1.5, xx), xx**1.5)
+        c2 = (np.pi / 2) ** 0.5 * _besselKernel(1.5, xx)
         c3 = (
             2
             / 7
             * (gamma(11 / 4))
             * (2**1.75)
-            * np.divide(jv(1.75, xx), xx**1.75)
+            * _besselKernel(1.75, xx)
         )
-        c4 = 2 * np.divide(jv(2.0, xx), xx**2.0)
+        c4 = 2 * _besselKernel(2.0, xx)
         s = (210 - 42 * a1 - 70 * a2 - 90 * a3 - 105 * a4) / 420
         return np.nan_to_num(
             (
@@ -1150,6 +1240,7 @@ class oimConvolutor(oimComponentFourier):
 
     name = "Convolution Component"
     shortname = "Conv"
+    cacheable = True
 
     def __init__(
         self,
@@ -1211,26 +1302,16 @@ class oimConvolutor(oimComponentFourier):
         nt, nwl = t.size, wl.size
         dims = (nt, nwl, dim, dim)
 
-        v = np.linspace(-0.5, 0.5, dim, endpoint=False)
-        vx, vy = np.meshgrid(v, v)
-
-        vx_arr = np.tile(vx[None, None, :, :], (nt, nwl, 1, 1))
-        vy_arr = np.tile(vy[None, None, :, :], (nt, nwl, 1, 1))
-        wl_arr = np.tile(wl[None, :, None, None], (nt, 1, dim, dim))
-        t_arr = np.tile(t[:, None, None, None], (1, nwl, dim, dim))
-
-        x_arr = (vx_arr * pixSize * dim).flatten()
-        y_arr = (vy_arr * pixSize * dim).flatten()
-        t_arr, wl_arr = t_arr.flatten(), wl_arr.flatten()
+        x_arr, y_arr, wl_arr, t_arr = _imageGrid(dim, pixSize, wl, t)
         x_arr, y_arr = self._directTranslate(x_arr, y_arr, wl_arr, t_arr)
 
         images = []
         for index, component in enumerate(self.components, start=1):
-            xp, yp = x_arr.copy(), y_arr.copy()
+            xp, yp = x_arr, y_arr
             if component.elliptic:
                 pa_rad = (
                     self.params[f"c{index}_pa"](wl_arr, t_arr)
-                ) * self.params[f"c{index}_pa"].unit.to(units.rad)
+                ) * self.params[f"c{index}_pa"].unit.to(u.rad)
 
                 co, si = np.cos(pa_rad), np.sin(pa_rad)
                 xpt = (xp * co - yp * si) * self.params[f"c{index}_elong"](
@@ -1240,25 +1321,15 @@ class oimConvolutor(oimComponentFourier):
             else:
                 xpt, ypt = xp, yp
 
-            img = component._imageFunction(
-                xpt.reshape(dims),
-                ypt.reshape(dims),
-                wl_arr.reshape(dims),
-                t_arr.reshape(dims),
+            img = component._imageFunction(xpt, ypt, wl_arr, t_arr)
+            images.append(
+                _normalizeImage(
+                    np.broadcast_to(img, dims),
+                    self.params[f"c{index}_f"](wl_arr, t_arr),
+                )
             )
 
-            tot = np.sum(img, axis=(2, 3))
-            for it, ti in enumerate(t):
-                for iwl, wli in enumerate(wl):
-                    if tot[it, iwl] != 0:
-                        img[it, iwl] = (
-                            img[it, iwl]
-                            / tot[it, iwl]
-                            * self.params[f"c{index}_f"](wli, ti)
-                        )
-            images.append(img)
-
-        img = np.zeros_like(img)
+        img = np.zeros_like(images[0])
         for iwl in range(nwl):
             for it in range(nt):
                 img[it, iwl] = convolve2d(
@@ -1268,4 +1339,4 @@ class oimConvolutor(oimComponentFourier):
                     fillvalue=0,
                 )
 
-        return img
+        return img * self.params["f"](wl_arr, t_arr)
@@ -28,6 +28,123 @@ from .oimUtils import (
 )
 from .oimExtinction import extlaw_FitzIndeb as extlaw
 
+def _fingerprint(value):
+    """Return a comparable snapshot of a value (arrays are converted to
+    bytes)."""
+    if isinstance(value, np.ndarray):
+        return (value.shape, value.tobytes())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(vi) for vi in value)
+    return value
+
+
+def _configFingerprint(param):
+    """Return a snapshot of the attributes of an interpolator that are not
+    parameters (e.g. kind, extrapolate or dependence)."""
+    parameters = (oimParam, oimParamLinker, oimParamNorm)
+    config = []
+    for key, value in vars(param).items():
+        if key.startswith("_") or isinstance(value, parameters):
+            continue
+        if isinstance(value, (list, tuple)) and any(
+            isinstance(vi, parameters) for vi in value
+        ):
+            continue
+        config.append((key, _fingerprint(value)))
+    return tuple(config)
+
+
+def _paramFingerprint(param):
+    """Return a snapshot of the values of all the oimParam on which a
+    parameter, linker, normalizer or interpolator depends, and of the
+    configuration of the linkers and interpolators."""
+    if isinstance(param, oimParamInterpolator):
+        return (
+            type(param),
+            _configFingerprint(param),
+            *[_paramFingerprint(pi) for pi in param.params],
+        )
+    if isinstance(param, oimParamLinker):
+        return (
+            param.op,
+            _paramFingerprint(param.param),
+            *[_paramFingerprint(fi) for fi in param.fact],
+        )
+    if isinstance(param, oimParamNorm):
+        return (param.norm, *[_paramFingerprint(pi) for pi in param.params])
+    if isinstance(param, oimParam):
+        return _fingerprint(param.value)
+    return _fingerprint(param)
+
+
+class _oimParams(dict):
+    """Dictionary of the parameters of a component.
+
+    Adding, replacing or removing a parameter (e.g. to link it to the
+    parameter of another component) tells the models that their parameter
+    registry has to be rebuilt.
+    """
+
+    def _changed(self):
+        oimParam._structureVersion += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+def _imageGrid(dim, pixSize, wl, t):
+    """Return the coordinates of a (nt, nwl, dim, dim) image cube as
+    broadcastable arrays: x and y of shape (1, 1, dim, dim) and wl and t of
+    shape (nt, nwl, 1, 1)."""
+    v = np.linspace(-0.5, 0.5, dim, endpoint=False) * pixSize * dim
+    x, y = np.meshgrid(v, v)
+    t_arr, wl_arr = np.meshgrid(t, wl, indexing="ij")
+    return (
+        x[None, None, :, :],
+        y[None, None, :, :],
+        wl_arr[:, :, None, None],
+        t_arr[:, :, None, None],
+    )
+
+
+def _normalizeImage(image, flux):
+    """Rescale each (t, wl) plane of an image cube to the given total flux.
+
+    The planes with a null total flux are left unchanged.
+    """
+    tot = np.sum(image, axis=(-2, -1), keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(tot != 0, flux / tot, 1)
+    return image * scale
+
+
 # TODO: Move somewhere else
 def getFourierComponents():
     """A function to get the list of all available components deriving from the
@@ -74,6 +191,24 @@ class oimComponent:
     shortname = "Gen comp"
     description = "This is the class from which all components derived"
 
+    # NOTE: True if the complex coherent flux can be computed for parameter
+    # values given as (N, 1) arrays, i.e. for N models at once
+    batchable = False
+
+    # NOTE: True if the last complex coherent flux can be reused as long as
+    # the parameters values and the coordinates arrays are unchanged. Only
+    # the classes whose whole state is in the fingerprint set it, and it is
+    # not inherited (see __init_subclass__)
+    cacheable = False
+
+    def __init_subclass__(cls, **kwargs):
+        """Disable the caching of the subclasses that do not set cacheable
+        themselves, as they may depend on attributes that are not in the
+        fingerprint."""
+        super().__init_subclass__(**kwargs)
+        if "cacheable" not in cls.__dict__:
+            cls.cacheable = False
+
     def __init__(self, **kwargs):
         """Create and initiliaze a new instance of the oimComponent class.
 
@@ -83,13 +218,21 @@ class oimComponent:
         self._wl = None  # None value <=> All wavelengths (from Data)
         self._t = [0]  # This component is static
 
-        self.params = {}
+        self.params = _oimParams()
         self.params["x"] = oimParam(**_standardParameters["x"])
         self.params["y"] = oimParam(**_standardParameters["y"])
         self.params["f"] = oimParam(**_standardParameters["f"])
         # self.params["dim"] = oimParam(**_standardParameters["dim"])
+        self._cache = None
         self._eval(**kwargs)
 
+    def __getstate__(self):
+        """Return the state of the component for pickling, without the cached
+        complex coherent flux."""
+        state = self.__dict__.copy()
+        state["_cache"] = None
+        return state
+
     def _paramstr(self):
         txt = []
         for paramname, param in self.params.items():
@@ -168,6 +311,65 @@ class oimComponent:
                 else:
                     self.params[key].value = value
 
+    def _getCacheState(self):
+        """Return the state of the component, other than its parameters, on
+        which the complex coherent flux depends."""
+        return _fingerprint(self._wl), _fingerprint(self._t)
+
+    def getFingerprint(self):
+        """Return a snapshot of the values of the parameters and of the
+        internal state of the component."""
+        return (
+            tuple(_paramFingerprint(p) for p in self.params.values()),
+            self._getCacheState(),
+        )
+
+    def clearCache(self):
+        """Clear the cached complex coherent flux."""
+        self._cache = None
+
+    def getCachedComplexCoherentFlux(self, ucoord, vcoord, wl=None, t=None):
+        """Return the complex coherent flux, reusing the last computed one if
+        the parameters and the coordinates arrays are unchanged.
+
+        The coordinates are compared by identity, so that arrays modified in
+        place are not detected.
+
+        Parameters
+        ----------
+        ucoord : numpy.ndarray
+            spatial coordinate u (in cycles/rad)
+        vcoord : numpy.ndarray
+            spatial coordinate vu (in cycles/rad) .
+        wl : numpy.ndarray, optional
+            wavelength(s) in meter. The default is None.
+        t :  numpy.ndarray, optional
+            time in s (mjd). The default is None.
+
+        Returns
+        -------
+        A numpy array of  the same size as u & v
+            The complex coherent flux.
+        """
+        if not self.cacheable:
+            return self.getComplexCoherentFlux(ucoord, vcoord, wl, t)
+
+        fingerprint = self.getFingerprint()
+        cache = getattr(self, "_cache", None)
+        if (
+            cache is not None
+            and cache[0] is ucoord
+            and cache[1] is vcoord
+            and cache[2] is wl
+            and cache[3] is t
+            and cache[4] == fingerprint
+        ):
+            return cache[5]
+
+        vc = self.getComplexCoherentFlux(ucoord, vcoord, wl, t)
+        self._cache = (ucoord, vcoord, wl, t, fingerprint, vc)
+        return vc
+
     def getComplexCoherentFlux(self, u, v, wl=None, t=None):
         """Compute and return the complex coherent flux for an array of u,v
         (and optionally wavelength and time ) coordinates
@@ -282,6 +484,7 @@ class oimComponentFourier(oimComponent):
 
     elliptic = False
     extincted = False
+    batchable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -326,26 +529,13 @@ class oimComponentFourier(oimComponent):
 
     def getImage(self, dim, pixSize, wl=None, t=None):
         t = np.array(t).flatten()
-        nt = t.size
         wl = np.array(wl).flatten()
-        nwl = wl.size
-
-        dims = (nt, nwl, dim, dim)
-
-        v = np.linspace(-0.5, 0.5, dim, endpoint=False)
-
-        vx, vy = np.meshgrid(v, v)
-
-        vx_arr = np.tile(vx[None, None, :, :], (nt, nwl, 1, 1))
-        vy_arr = np.tile(vy[None, None, :, :], (nt, nwl, 1, 1))
-        wl_arr = np.tile(wl[None, :, None, None], (nt, 1, dim, dim))
-        t_arr = np.tile(t[:, None, None, None], (1, nwl, dim, dim))
-
-        x_arr = (vx_arr * pixSize * dim).flatten()
-        y_arr = (vy_arr * pixSize * dim).flatten()
-        wl_arr = wl_arr.flatten()
-        t_arr = t_arr.flatten()
+        dims = (t.size, wl.size, dim, dim)
 
+        # NOTE: The coordinates are not tiled to the size of the image cube.
+        # The image function is evaluated on broadcastable arrays and x and y
+        # have the shape (1, 1, dim, dim) if the position is achromatic
+        x_arr, y_arr, wl_arr, t_arr = _imageGrid(dim, pixSize, wl, t)
         x_arr, y_arr = self._directTranslate(x_arr, y_arr, wl_arr, t_arr)
 
         if self.elliptic:
@@ -360,31 +550,12 @@ class oimComponentFourier(oimComponent):
             x_arr = xp * self.params["elong"](wl_arr, t_arr)
             y_arr = yp
 
+        flux = self.params["f"](wl_arr, t_arr)
         if self.extincted:
-            extfactor = 10**(-0.4*extlaw(wl, self.params["A_V"]()))
-        else:
-            extfactor = 1.0
+            flux = flux * 10 ** (-0.4 * extlaw(wl_arr, self.params["A_V"]()))
 
-        # FIXME: Did I correctly infer the dimensions of the image? (PAB)
-        image = self._imageFunction(
-            x_arr.reshape(dims),
-            y_arr.reshape(dims),
-            wl_arr.reshape(dims),
-            t_arr.reshape(dims),
-        ) * extfactor[np.newaxis, :, np.newaxis, np.newaxis]
-
-        tot = np.sum(image, axis=(2, 3))
-
-        # TODO: No loop for normalization
-        for it, ti in enumerate(t):
-            for iwl, wli in enumerate(wl):
-                if tot[it, iwl] != 0:
-                    image[it, iwl, :, :] = (
-                        image[it, iwl, :, :]
-                        / tot[it, iwl]
-                        * self.params["f"](wli, ti)
-                    )
-        return image
+        image = self._imageFunction(x_arr, y_arr, wl_arr, t_arr)
+        return _normalizeImage(np.broadcast_to(image, dims), flux)
 
     def getNonRegularImage(self, xx, yy, wl=None, t=None):
 
@@ -462,6 +633,17 @@ class oimComponentImage(oimComponent):
         self.FTBackendData = None
         self._eval(**kwargs)
 
+    def _getCacheState(self):
+        return (
+            *super()._getCacheState(),
+            self._pixSize,
+            self.normalizeImage,
+            self._allowExternalRotation,
+            oimOptions.ft.binning,
+            oimOptions.ft.padding,
+            type(self.FTBackend),
+        )
+
     def getComplexCoherentFlux(self, ucoord, vcoord, wl=None, t=None):
         if wl is None:
             wl = ucoord * 0
@@ -537,24 +719,10 @@ class oimComponentImage(oimComponent):
             t = 0
 
         t = np.array(t).flatten()
-        nt = t.size
         wl = np.array(wl).flatten()
-        nwl = wl.size
-        dims = (nt, nwl, dim, dim)
-
-        v = np.linspace(-0.5, 0.5, dim, endpoint=False)
-        vx, vy = np.meshgrid(v, v)
-
-        vx_arr = np.tile(vx[None, None, :, :], (nt, nwl, 1, 1))
-        vy_arr = np.tile(vy[None, None, :, :], (nt, nwl, 1, 1))
-        wl_arr = np.tile(wl[None, :, None, None], (nt, 1, dim, dim))
-        t_arr = np.tile(t[:, None, None, None], (1, nwl, dim, dim))
-
-        x_arr = (vx_arr * pixSize * dim).flatten()
-        y_arr = (vy_arr * pixSize * dim).flatten()
-        wl_arr = wl_arr.flatten()
-        t_arr = t_arr.flatten()
+        dims = (t.size, wl.size, dim, dim)
 
+        x_arr, y_arr, wl_arr, t_arr = _imageGrid(dim, pixSize, wl, t)
         x_arr, y_arr = self._directTranslate(x_arr, y_arr, wl_arr, t_arr)
 
         if self._allowExternalRotation == True:
@@ -571,11 +739,6 @@ class oimComponentImage(oimComponent):
             else:
                 x_arr = xp
 
-        if self.extincted:
-            extfactor = 10**(-0.4*extlaw(wl, self.params["A_V"]()))
-        else:
-            extfactor = 1.0
-
         im0 = self._internalImage()
 
         if im0 is None:
@@ -583,7 +746,9 @@ class oimComponentImage(oimComponent):
         else:
             im0 = np.swapaxes(im0, -2, -1)
             grid = self._getInternalGrid()
-            coord = np.transpose(np.array([t_arr, wl_arr, x_arr, y_arr]))
+            coord = np.stack(
+                np.broadcast_arrays(t_arr, wl_arr, x_arr, y_arr), axis=-1
+            )
 
             im = interpolate.interpn(
                 grid, im0, coord, bounds_error=False, fill_value=0
@@ -592,20 +757,18 @@ class oimComponentImage(oimComponent):
             f = np.sum(im)
             im = im / f * f0
 
-        # FIXME: Did I correctly infer the dimensions of the image? (PAB)
-        im = im.reshape(dims) * extfactor[np.newaxis, :, np.newaxis, np.newaxis]
+        if self.extincted:
+            extfactor = 10 ** (-0.4 * extlaw(wl_arr, self.params["A_V"]()))
+        else:
+            extfactor = 1.0
 
         if self.normalizeImage == True:
-            # TODO: No loop for normalization
-            tot = np.sum(im, axis=(2, 3))
-            for it, ti in enumerate(t):
-                for iwl, wli in enumerate(wl):
-                    if tot[it, iwl] != 0:
-                        im[it, iwl, :, :] = (
-                            im[it, iwl, :, :]
-                            / tot[it, iwl]
-                            * self.params["f"](wli, ti)
-                        )
+            flux = self.params["f"](wl_arr, t_arr) * extfactor
+            return _normalizeImage(np.broadcast_to(im, dims), flux)
+
+        im = im * extfactor
+        if im.shape != dims:
+            im = np.broadcast_to(im, dims).copy()
         return im
 
     def getInternalImage(self, wl, t):
@@ -618,11 +781,7 @@ class oimComponentImage(oimComponent):
             res = self._imageFunction(x_arr, y_arr, wl_arr, t_arr)
 
         if self.normalizeImage == True:
-            for it in range(res.shape[0]):
-                for iwl in range(res.shape[1]):
-                    res[it, iwl, :, :] = res[it, iwl, :, :] / np.sum(
-                        res[it, iwl, :, :]
-                    )
+            res = _normalizeImage(res, 1)
 
         return res
 
@@ -661,14 +820,16 @@ class oimComponentImage(oimComponent):
 
         else:
             t = np.array(t0).flatten()
-            nt = t.size
             wl = np.array(wl0).flatten()
-            nwl = wl.size
             xx, yy = np.meshgrid(xy, xy)
-            x_arr = np.tile(xx[None, None, :, :], (nt, nwl, 1, 1))
-            y_arr = np.tile(yy[None, None, :, :], (nt, nwl, 1, 1))
-            wl_arr = np.tile(wl[None, :, None, None], (nt, 1, dim, dim))
-            t_arr = np.tile(t[:, None, None, None], (1, nwl, dim, dim))
+
+            # NOTE: Read-only views on the coordinates, no copy is made
+            x_arr, y_arr, wl_arr, t_arr = np.broadcast_arrays(
+                xx[None, None, :, :],
+                yy[None, None, :, :],
+                wl[None, :, None, None],
+                t[:, None, None, None],
+            )
 
             if flatten == True:
                 return (
@@ -725,6 +886,31 @@ class oimComponentRadialProfile(oimComponent):
 
         self._eval(**kwargs)
 
+    def _getCacheState(self):
+        return (
+            *super()._getCacheState(),
+            getattr(self, "_pixSize", None),
+            self.normalizeImage,
+            self.precision,
+            oimOptions.model.grid.type,
+        )
+
+    @property
+    def _r(self) -> np.ndarray:
+        """Gets the radial grid (in mas)."""
+        return self.__r
+
+    @_r.setter
+    def _r(self, value: Any) -> None:
+        """Sets the radial grid (in mas).
+
+        The radial grid is not part of the fingerprint of the component, so
+        that setting it clears the cache (a grid modified in place is not
+        detected).
+        """
+        self.__r = value
+        self.clearCache()
+
     def _getInternalGrid(self, simple=True, flatten=False, wl=None, t=None):
 
         wl0 = np.sort(np.unique(wl)) if self._wl is None else self._wl
@@ -829,22 +1015,9 @@ class oimComponentRadialProfile(oimComponent):
     def getImage(self, dim, pixSize, wl=None, t=None):
         wl, t = 0 if wl is None else wl, 0 if t is None else t
         t, wl = np.array(t).flatten(), np.array(wl).flatten()
-        nt, nwl = t.size, wl.size
-        dims = (nt, nwl, dim, dim)
-
-        v = np.linspace(-0.5, 0.5, dim, endpoint=False)
-        vx, vy = np.meshgrid(v, v)
-
-        vx_arr = np.tile(vx[None, None, :, :], (nt, nwl, 1, 1))
-        vy_arr = np.tile(vy[None, None, :, :], (nt, nwl, 1, 1))
-        wl_arr = np.tile(wl[None, :, None, None], (nt, 1, dim, dim))
-        t_arr = np.tile(t[:, None, None, None], (1, nwl, dim, dim))
-
-        x_arr = (vx_arr * pixSize * dim).flatten()
-        y_arr = (vy_arr * pixSize * dim).flatten()
-        wl_arr = wl_arr.flatten()
-        t_arr = t_arr.flatten()
+        dims = (t.size, wl.size, dim, dim)
 
+        x_arr, y_arr, wl_arr, t_arr = _imageGrid(dim, pixSize, wl, t)
         x_arr, y_arr = self._directTranslate(x_arr, y_arr, wl_arr, t_arr)
         if self.elliptic:
             pa_rad = (self.params["pa"](wl_arr, t_arr)) * self.params[
@@ -856,29 +1029,24 @@ class oimComponentRadialProfile(oimComponent):
             y_arr = yp
             x_arr = xp * self.params["elong"](wl_arr, t_arr)
 
+        # NOTE: The radial profile functions expect flattened coordinates
+        r_arr = np.broadcast_to(np.hypot(x_arr, y_arr), dims).flatten()
+        im = self._radialProfileFunction(
+            r_arr,
+            np.broadcast_to(wl_arr, dims).flatten(),
+            np.broadcast_to(t_arr, dims).flatten(),
+        )
+        im = im.reshape(dims)
+
         if self.extincted:
-            extfactor = 10**(-0.4*extlaw(wl, self.params["A_V"]()))
+            extfactor = 10 ** (-0.4 * extlaw(wl_arr, self.params["A_V"]()))
         else:
             extfactor = 1.0
 
-        r_arr = np.hypot(x_arr, y_arr)
-        im = self._radialProfileFunction(r_arr, wl_arr, t_arr)
-        # FIXME: Did I correctly infer the dimensions of the image? (PAB)
-        im = im.reshape(dims) * extfactor[np.newaxis, :, np.newaxis, np.newaxis]
-
         if self.normalizeImage:
-            # TODO: No loop for normalization
-            tot = np.sum(im, axis=(2, 3))
-            for it, ti in enumerate(t):
-                for iwl, wli in enumerate(wl):
-                    if tot[it, iwl] != 0:
-                        im[it, iwl, :, :] = (
-                            im[it, iwl, :, :]
-                            / tot[it, iwl]
-                            * self.params["f"](wli, ti)
-                        )
-
-        return im
+            flux = self.params["f"](wl_arr, t_arr) * extfactor
+            return _normalizeImage(im, flux)
+        return im * extfactor
 
     def getComplexCoherentFlux(self, ucoord, vcoord, wl=None, t=None):
 
@@ -939,6 +1107,7 @@ class oimComponentFitsImage(oimComponentImage):
     extincted = False
     name = "Fits Image Component"
     shortname = "Fits_Comp"
+    cacheable = True
 
     def __init__(self, fitsImage=None, useinternalPA=False, **kwargs):
         super().__init__(**kwargs)
@@ -953,6 +1122,7 @@ class oimComponentFitsImage(oimComponentImage):
         self._eval(**kwargs)
 
     def loadImage(self, fitsImage, useinternalPA=False):
+        self.clearCache()
         if isinstance(fitsImage, str) or isinstance(fitsImage, Path):
             try:
                 im = fits.open(fitsImage)[0]
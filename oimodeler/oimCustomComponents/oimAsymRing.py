@@ -9,6 +9,7 @@ from ..oimParam import _standardParameters, oimParam
 class oimAEIRing(oimIRing):
     name = "Asymmetrical Elliptical Infinitesimal Ring"
     shorname = "AEIR"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -22,7 +23,7 @@ class oimAEIRing(oimIRing):
     def _visFunction(self, xp, yp, rho, wl, t):
         vis = super()._visFunction(xp, yp, rho, wl, t)
         skw, skwPa = self.params["skw"](wl, t), self.params["skwPa"](wl, t)
-        skwPa *= self.params["skwPa"].unit.to(u.rad)
+        skwPa = skwPa * self.params["skwPa"].unit.to(u.rad)
         d = self.params["d"](wl, t) * self.params["d"].unit.to(u.rad)
         return vis + -1j * skw * np.cos(np.arctan2(xp, yp) - skwPa) * j1(
             np.pi * d * rho
@@ -31,7 +32,7 @@ class oimAEIRing(oimIRing):
     def _imageFunction(self, xx, yy, wl, t):
         img = super()._imageFunction(xx, yy, wl, t)
         skw, skwPa = self.params["skw"](wl, t), self.params["skwPa"](wl, t)
-        skwPa *= self.params["skwPa"].unit.to(u.rad)
+        skwPa = skwPa * self.params["skwPa"].unit.to(u.rad)
         c, s, polar_angle = (
             skw * np.sin(skwPa),
             skw * np.cos(skwPa),
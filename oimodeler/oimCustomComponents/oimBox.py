@@ -8,6 +8,7 @@ from ..oimParam import oimParam
 class oimBox(oimComponentFourier):
     name = "Rectangular Box"
     shortname = "BOX"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -33,6 +33,7 @@ class oimCustomSkewedRing(oimComponentFourier):
     """
     name = " Ring with Custom intensity profile and skwedeness"
     shortname = "CSRing"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -13,6 +13,7 @@ from ..oimParam import oimParam, _standardParameters
 class oimExpRing(oimComponentRadialProfile):
     name = "Exponential Ring"
     shortname = "ExpR"
+    cacheable = True
 
     elliptic = True
 
@@ -253,6 +253,7 @@ def fastRotator_2(dim0, R_eq, incl, veq, Mstar, Tp, lam, beta=np.nan, distance=1
 class oimFastRotator(oimComponentImage):
     name = "Fast Rotator"
     shortname = "FRot"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super(). __init__(**kwargs)
@@ -296,6 +297,7 @@ class oimFastRotator(oimComponentImage):
 class oimFastRotatorLLDD(oimComponentImage):
     name = "Fast Rotator"
     shortname = "FRot"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super(). __init__(**kwargs)
@@ -342,6 +344,7 @@ class oimFastRotatorLLDD(oimComponentImage):
 class oimFastRotatorQuadLDD(oimComponentImage):
     name = "Fast Rotator"
     shortname = "FRot"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super(). __init__(**kwargs)
@@ -388,6 +391,7 @@ class oimFastRotatorQuadLDD(oimComponentImage):
 class oimFastRotatorNLLDD(oimComponentImage):
     name = "Fast Rotator"
     shortname = "FRot"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super(). __init__(**kwargs)
@@ -439,6 +443,7 @@ class oimFastRotatorNLLDD(oimComponentImage):
 class oimFastRotatorMasse(oimComponentImage):
     name = "Fast Rotator"
     shortname = "FRot"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super(). __init__(**kwargs)
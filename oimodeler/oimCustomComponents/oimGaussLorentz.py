@@ -8,6 +8,7 @@ from ..oimParam import _standardParameters, oimParam
 class oimGaussLorentz(oimComponentFourier):
     name = "Gauss-Lorentzian"
     shortname = "GL"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
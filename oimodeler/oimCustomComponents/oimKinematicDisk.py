@@ -23,6 +23,7 @@ angToSize=lambda x: (units.AU,units.mas,lambda y:1000*y/x.to(units.parsec).value
 class oimKinematicDisk(oimComponentImage):
     name = "kinematic disk component"
     shorname = "kinDisk"
+    cacheable = True
     elliptic = False
     
     def __init__(self, **kwargs):
@@ -43,6 +43,7 @@ class oimRadialRing(oimComponentRadialProfile):
     """
     name = "Radial Ring"
     shortname = "RadRing"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -43,6 +43,7 @@ class oimRadialRing2(oimComponentRadialProfile):
     """
     name = "Radial Ring2"
     shortname = "RadRing2"
+    cacheable = True
     elliptic = False
 
     def __init__(self, **kwargs):
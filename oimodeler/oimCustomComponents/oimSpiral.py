@@ -14,6 +14,7 @@ from ..oimParam import oimParam, _standardParameters
 class oimSpiral(oimComponentImage):
     name = "Spiral component"
     shorname = "Sp"
+    cacheable = True
 
     # Set elliptic to True to use  elong keyword for a change of variable
     # to "flatten" objects
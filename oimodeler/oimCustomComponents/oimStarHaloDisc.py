@@ -10,6 +10,7 @@ from ..oimParam import _standardParameters, oimParam
 class oimStarHaloGaussLorentz(oimComponentFourier):
     name = "Star and Halo component with Gauss-Lorentzian disk"
     shortname = "SHGL"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -119,19 +120,26 @@ class oimStarHaloGaussLorentz(oimComponentFourier):
         )
         return (1 - flor) * image_gauss + flor * image_lor
 
+    def _image_star(self, xx, yy):
+        """Unit image of the star: its flux is in the central pixel of each
+        (t, wl) plane of the image cube."""
+        val = np.abs(xx) + np.abs(yy)
+        val = np.reshape(val, (-1, *np.shape(val)[-2:]))[0]
+        image_star = np.zeros(val.shape)
+        image_star[np.unravel_index(np.argmin(val), val.shape)] = 1
+        return image_star
+
     def _imageFunction(self, xx, yy, wl, t):
         fh = self.params["fh"](wl, t)
         fs, fc = self.params["fs"](wl, t), self.params["fc"](wl, t)
-        val = np.abs(xx) + np.abs(yy)
-        idx = np.unravel_index(np.argmin(val), np.shape(val))
         image_disk = fc * self._image_gauss_lorentz(xx, yy, wl, t)
-        image_disk[idx] += fs
-        return image_disk + fh
+        return image_disk + fs * self._image_star(xx, yy) + fh
 
 
 class oimStarHaloIRing(oimStarHaloGaussLorentz):
     name = "Star and Halo component with Gauss-Lorentzian ring convolved disk"
     shortname = "SHGLR"
+    cacheable = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -168,7 +176,7 @@ class oimStarHaloIRing(oimStarHaloGaussLorentz):
         wavelength_ratio = self.params["wl0"](wl, t) / wl
 
         skw, skwPa = self.params["skw"](wl, t), self.params["skwPa"](wl, t)
-        skwPa *= self.params["skwPa"].unit.to(u.rad)
+        skwPa = skwPa * self.params["skwPa"].unit.to(u.rad)
 
         ar = np.sqrt(10 ** (2 * la) / (1 + 10 ** (2 * lkr)))
         xx = 2 * np.pi * ar * u.mas.to(u.rad) * rho
@@ -199,6 +207,8 @@ class oimStarHaloIRing(oimStarHaloGaussLorentz):
     def _imageFunction(self, xx, yy, wl, t):
         fh = self.params["fh"](wl, t)
         fs, fc = self.params["fs"](wl, t), self.params["fc"](wl, t)
+        la, lkr = self.params["la"](wl, t), self.params["lkr"](wl, t)
+        ar = np.sqrt(10 ** (2 * la) / (1 + 10 ** (2 * lkr)))
         skw, skwPa = self.params["skw"](wl, t), self.params["skwPa"](wl, t)
         skwPa = (skwPa + 90) * self.params["skwPa"].unit.to(u.rad)
         # TODO: Check if the orientation here is correct, might be 90 degrees shifted
@@ -206,9 +216,7 @@ class oimStarHaloIRing(oimStarHaloGaussLorentz):
         c, s = skw * np.cos(skwPa), skw * np.sin(skwPa)
         polar_angle = np.arctan2(yy, xx)
 
-        radius, val = np.hypot(xx, yy), np.abs(xx) + np.abs(yy)
-        idx = np.unravel_index(np.argmin(val), np.shape(val))
-
+        radius = np.hypot(xx, yy)
         dx = np.max(
             [
                 np.abs(1.0 * (xx[0, 0, 0, 1] - xx[0, 0, 0, 0])),
@@ -216,11 +224,16 @@ class oimStarHaloIRing(oimStarHaloGaussLorentz):
             ]
         )
 
-        radial_profile = (radius >= self.ar) & (radius <= (self.ar + dx))
+        radial_profile = (radius >= ar) & (radius <= (ar + dx))
         image_ring = 1 / (2 * np.pi) * radial_profile
-        image_ring *= 1 + c * np.cos(polar_angle) + s * np.sin(polar_angle)
+        image_ring = image_ring * (
+            1 + c * np.cos(polar_angle) + s * np.sin(polar_angle)
+        )
+        # NOTE: Only convolved along the spatial axes of the image cube
         image = fc * fftconvolve(
-            self._image_gauss_lorentz(xx, yy, wl, t), image_ring, mode="same"
+            self._image_gauss_lorentz(xx, yy, wl, t),
+            image_ring,
+            mode="same",
+            axes=(-2, -1),
         )
-        image[idx] += fs
-        return image + fh
+        return image + fs * self._image_star(xx, yy) + fh
@@ -56,6 +56,7 @@ class oimTempGrad(oimComponentRadialProfile):
 
     name = "Temperature Gradient"
     shortname = "TempGrad"
+    cacheable = True
     elliptic = True
 
     def __init__(self, **kwargs):
@@ -218,6 +219,7 @@ class oimTempGrad(oimComponentRadialProfile):
 
     def setKappaAbs(self, kappa_file: str | Path, um: int = 1) -> None:
         """Sets the absorption opacity."""
+        self.clearCache()
         kappa_data = np.loadtxt(kappa_file, usecols=(0, 1))
         if um == 1:
             self._wl_kappa_abs = kappa_data[:, 0] * 1e-6
@@ -263,6 +263,345 @@ def oimDataGetVectCoord(
     return u, v, wl, dwl, mjd, nB, nwl
 
 
+class oimObservablePlan:
+    """A flat, index-based description of all the observables contained in an
+    oimData object.
+
+    All the VIS2DATA, VISAMP, VISPHI, T3AMP, T3PHI and FLUXDATA values of all
+    the files and arrays are concatenated in a single vector. For each
+    observable type, the plan stores the indices of the complex coherent
+    fluxes (in the oimData.vect_u, vect_v... vectors) needed to compute it, so
+    that all the observables can be computed with a few vectorized
+    operations.
+
+    Parameters
+    ----------
+    data : oimData
+        The prepared oimData object (i.e. with the struct_* lists filled).
+
+    Attributes
+    ----------
+    size : int
+        The total number of observables.
+    val : numpy.ndarray
+        The observed values.
+    err : numpy.ndarray
+        The errors on the observed values.
+    flag : numpy.ndarray
+        The flags of the observed values.
+    invErr : numpy.ndarray
+        The inverse of the errors (infinite for null errors).
+    valid : numpy.ndarray
+        True for the observables used in the chi2, i.e. not flagged and with
+        finite values and finite non-null errors.
+    weight : numpy.ndarray
+        The inverse of the errors for the valid observables and zero for the
+        others.
+    validVal : numpy.ndarray
+        The observed values for the valid observables and zero for the
+        others.
+    isPhase : numpy.ndarray
+        True for the phase observables (VISPHI and T3PHI).
+    phaseIndex : numpy.ndarray
+        The positions of the phase observables in the flat vector.
+    phasor : numpy.ndarray
+        The unit phasors exp(i*phi) of the observed phases.
+    nelQuantity : numpy.ndarray
+        The number of unflagged observables with non-null errors for each
+        quantity of the quantities tuple.
+    dataType : numpy.ndarray
+        The type of each observable as an oimDataType value.
+    quantity : numpy.ndarray
+        The index in the quantities tuple of each observable.
+    gather : dict
+        For each kernel of the kernels dictionary needed by the data, a
+        dictionary containing the indices of the complex coherent fluxes of
+        the baseline or of the three baselines of the triangle ("idx1",
+        "idx2", "idx3"), of the zero-frequency used for normalization
+        ("idxNorm"), for differential quantities the start and size of the
+        group of wavelengths of each baseline ("groupStart", "groupSize"),
+        and for each oimDataType computed by the kernel, the indices of the
+        kernel points and the positions in the flat vector of the
+        observables ("outputs").
+    blocks : list of tuple
+        For each array and quantity: the file index, the extension index, the
+        column name, the start and stop positions in the flat vector, and the
+        number of rows and of wavelengths.
+    """
+
+    quantities = (
+        "VIS2DATA",
+        "VISAMP",
+        "VISPHI",
+        "T3AMP",
+        "T3PHI",
+        "FLUXDATA",
+        "FLUX",
+    )
+    phaseQuantities = ("VISPHI", "T3PHI")
+
+    # NOTE: The observables computed from the same complex quantity: the
+    # normalized visibility, the coherent flux, the visibility relative to
+    # its mean over the wavelengths, and the bispectrum.
+    kernels = {
+        "VIS": (oimDataType.VIS2DATA, oimDataType.VISAMP_ABS),
+        "CORR": (
+            oimDataType.VISAMP_COR,
+            oimDataType.VISPHI_ABS,
+            oimDataType.FLUXDATA,
+        ),
+        "DIF": (oimDataType.VISAMP_DIF, oimDataType.VISPHI_DIF),
+        "T3": (oimDataType.T3AMP, oimDataType.T3PHI),
+    }
+
+    def __init__(self, data) -> None:
+        self.blocks = []
+        self._masks = {}
+        self._nelChi2 = {}
+
+        fields = ["val", "err", "flag", "dataType", "quantity"]
+        fields += ["idx1", "idx2", "idx3", "idxNorm", "group", "source"]
+        flat = {key: [] for key in fields}
+
+        start, idx, igroup, isource = 0, 0, 0, 0
+        for ifile, datai in enumerate(data.data):
+            for iarr, arrType in enumerate(data.struct_arrType[ifile]):
+                dataType = data.struct_dataType[ifile][iarr]
+                if dataType == oimDataType.NONE:
+                    continue
+
+                arrNum = data.struct_arrNum[ifile][iarr]
+                nB = data.struct_nB[ifile][iarr]
+                nwl = data.struct_nwl[ifile][iarr]
+                codes, names = self._getCodesAndNames(
+                    arrType, dataType, datai[arrNum]
+                )
+
+                idxNorm = np.tile(idx + np.arange(nwl), nB)
+                rows = idx + np.arange(nB * nwl)
+                if arrType == "OI_FLUX":
+                    nrows = nB
+                    idx1, idx2, idx3 = rows, rows, rows
+                    idxNorm = rows
+                elif arrType == "OI_T3":
+                    nrows = (nB - 1) // 3
+                    n = nrows * nwl
+                    idx1, idx2, idx3 = (
+                        rows[nwl + i * n : nwl + (i + 1) * n] for i in range(3)
+                    )
+                    idxNorm = idxNorm[:n]
+                else:
+                    nrows = nB - 1
+                    idx1 = idx2 = idx3 = rows[nwl:]
+                    idxNorm = idxNorm[: nrows * nwl]
+
+                group = igroup + np.repeat(np.arange(nrows), nwl)
+                npts = nrows * nwl
+                for ival, (code, name) in enumerate(zip(codes, names)):
+                    vals = data.struct_val[ifile][iarr]
+                    errs = data.struct_err[ifile][iarr]
+                    flags = data.struct_flag[ifile][iarr]
+                    flat["val"].append(np.reshape(vals[ival], npts))
+                    flat["err"].append(np.reshape(errs[ival], npts))
+                    flat["flag"].append(np.reshape(flags[ival], npts))
+                    flat["dataType"].append(np.full(npts, int(code)))
+                    flat["quantity"].append(
+                        np.full(npts, self.quantities.index(name))
+                    )
+                    flat["idx1"].append(idx1)
+                    flat["idx2"].append(idx2)
+                    flat["idx3"].append(idx3)
+                    flat["idxNorm"].append(idxNorm)
+                    flat["group"].append(group)
+                    flat["source"].append(isource + np.arange(npts))
+                    self.blocks.append(
+                        (ifile, arrNum, name, start, start + npts, nrows, nwl)
+                    )
+                    start += npts
+
+                igroup += nrows
+                isource += npts
+                idx += nB * nwl
+
+        dtypes = dict(flag=bool, dataType=int, quantity=int)
+        for key in fields:
+            if flat[key]:
+                value = np.concatenate(flat[key])
+            else:
+                value = np.array([], dtype=dtypes.get(key, float))
+            setattr(self, key, value.astype(dtypes.get(key, value.dtype)))
+
+        for key in ["idx1", "idx2", "idx3", "idxNorm", "group", "source"]:
+            setattr(self, key, getattr(self, key).astype(int))
+
+        self.size = start
+        with np.errstate(divide="ignore"):
+            self.invErr = 1 / self.err
+        self.isPhase = np.isin(
+            self.quantity,
+            [self.quantities.index(name) for name in self.phaseQuantities],
+        )
+
+        # NOTE: The constants of the chi2 computation. Invalid observables
+        # get a null weight and value so that no masking or NaN handling is
+        # needed when computing the chi2
+        with np.errstate(invalid="ignore"):
+            self.valid = (
+                ~self.flag
+                & (self.err != 0)
+                & np.isfinite(self.err)
+                & np.isfinite(self.val)
+            )
+        self.weight = np.where(self.valid, self.invErr, 0)
+        self.validVal = np.where(self.valid, self.val, 0)
+        self.phaseIndex = np.flatnonzero(self.isPhase)
+        self.phasor = np.exp(1j * np.deg2rad(self.validVal[self.phaseIndex]))
+        # NOTE: As before, unflagged NaN values are counted in nelChi2
+        # although they do not contribute to the chi2
+        self.nelQuantity = np.bincount(
+            self.quantity[~self.flag & (self.err != 0)],
+            minlength=len(self.quantities),
+        )
+
+        # NOTE: The observables of an array computed by the same kernel (for
+        # instance T3AMP and T3PHI) share the same points of the kernel
+        self.gather = {}
+        for kernel, codes in self.kernels.items():
+            pos = np.flatnonzero(np.isin(self.dataType, codes))
+            if pos.size == 0:
+                continue
+            _, first, inverse = np.unique(
+                self.source[pos], return_index=True, return_inverse=True
+            )
+            inverse = np.reshape(inverse, -1)
+            gatheri = {}
+            for key in ["idx1", "idx2", "idx3", "idxNorm"]:
+                gatheri[key] = getattr(self, key)[pos[first]]
+            groups = self.group[pos[first]]
+            newGroup = np.concatenate(([True], groups[1:] != groups[:-1]))
+            gatheri["groupStart"] = np.flatnonzero(newGroup)
+            gatheri["groupSize"] = np.diff(
+                np.append(gatheri["groupStart"], first.size)
+            )
+            gatheri["outputs"] = {}
+            for code in codes:
+                isCode = self.dataType[pos] == code
+                if np.any(isCode):
+                    gatheri["outputs"][code] = (inverse[isCode], pos[isCode])
+            self.gather[kernel] = gatheri
+
+    @staticmethod
+    def _getCodesAndNames(
+        arrType: str, dataType: oimDataType, arr: fits.BinTableHDU
+    ) -> Tuple[List[oimDataType], List[str]]:
+        """Return the oimDataType and column name of each quantity of an
+        array in the same order as the oimGetDataValErrAndTypeFlag
+        function."""
+        codes, names = [], []
+        if arrType == "OI_VIS2":
+            codes.append(oimDataType.VIS2DATA)
+            names.append("VIS2DATA")
+        elif arrType == "OI_VIS":
+            for code in [
+                oimDataType.VISAMP_ABS,
+                oimDataType.VISAMP_DIF,
+                oimDataType.VISAMP_COR,
+            ]:
+                if dataType & code:
+                    codes.append(code)
+                    names.append("VISAMP")
+                    break
+            for code in [oimDataType.VISPHI_ABS, oimDataType.VISPHI_DIF]:
+                if dataType & code:
+                    codes.append(code)
+                    names.append("VISPHI")
+                    break
+        elif arrType == "OI_T3":
+            for code, name in [
+                (oimDataType.T3AMP, "T3AMP"),
+                (oimDataType.T3PHI, "T3PHI"),
+            ]:
+                if dataType & code:
+                    codes.append(code)
+                    names.append(name)
+        elif arrType == "OI_FLUX":
+            codes.append(oimDataType.FLUXDATA)
+            # NOTE: GRAVITY uses FLUX instead of FLUXDATA
+            if "FLUXDATA" in [c.name for c in arr.data.columns]:
+                names.append("FLUXDATA")
+            else:
+                names.append("FLUX")
+        return codes, names
+
+    def getMask(self, dataTypes: List[str]) -> np.ndarray:
+        """Return the mask of the observables belonging to the given list of
+        quantities (for instance ["VIS2DATA", "T3PHI"]).
+
+        Parameters
+        ----------
+        dataTypes : list of str
+            The names of the quantities.
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            A boolean array of the size of the plan.
+        """
+        key = tuple(dataTypes)
+        if key not in self._masks:
+            selected = [
+                i for i, name in enumerate(self.quantities) if name in key
+            ]
+            self._masks[key] = np.isin(self.quantity, selected)
+        return self._masks[key]
+
+    def getChi2Mask(self, dataTypes: List[str]) -> np.ndarray:
+        """Return the mask of the observables belonging to the given list of
+        quantities as a float array, so that the chi2 can be computed as a
+        dot product with the squared residuals.
+
+        Parameters
+        ----------
+        dataTypes : list of str
+            The names of the quantities.
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            A float array of the size of the plan with ones for the selected
+            observables and zeros for the others.
+        """
+        key = ("chi2",) + tuple(dataTypes)
+        if key not in self._masks:
+            self._masks[key] = self.getMask(dataTypes).astype(float)
+        return self._masks[key]
+
+    def getNelChi2(self, dataTypes: List[str]) -> int:
+        """Return the number of observables of the given list of quantities
+        that are not flagged and have a non-null error.
+
+        Parameters
+        ----------
+        dataTypes : list of str
+            The names of the quantities.
+
+        Returns
+        -------
+        nelChi2 : int
+            The number of observables used in the chi2 computation.
+        """
+        key = tuple(dataTypes)
+        if key not in self._nelChi2:
+            self._nelChi2[key] = int(
+                sum(
+                    self.nelQuantity[i]
+                    for i, name in enumerate(self.quantities)
+                    if name in key
+                )
+            )
+        return self._nelChi2[key]
+
+
 class oimData:
     """A class to hold and manipulate data
 
@@ -288,6 +627,13 @@ class oimData:
         self.vect_wl = None
         self.vect_dwl = None
         self.vect_mjd = None
+        self.unique_u = None
+        self.unique_v = None
+        self.unique_wl = None
+        self.unique_dwl = None
+        self.unique_mjd = None
+        self.unique_inverse = None
+        self.plan = None
 
         self._prepared = False
 
@@ -595,6 +941,27 @@ class oimData:
                     self.struct_val[-1].append(val)
                     self.struct_err[-1].append(err)
                     self.struct_flag[-1].append(flag)
+
+        # NOTE: The zero frequencies and the baselines shared by the OI_VIS,
+        # OI_VIS2 and OI_T3 tables are duplicated in the vect_* arrays. The
+        # model only needs to be computed on the unique coordinates.
+        coords = np.stack(
+            (
+                self.vect_u,
+                self.vect_v,
+                self.vect_wl,
+                self.vect_dwl,
+                self.vect_mjd,
+            ),
+            axis=-1,
+        )
+        unique, inverse = np.unique(coords, axis=0, return_inverse=True)
+        self.unique_u, self.unique_v = unique[:, 0], unique[:, 1]
+        self.unique_wl, self.unique_dwl = unique[:, 2], unique[:, 3]
+        self.unique_mjd = unique[:, 4]
+        self.unique_inverse = np.reshape(inverse, -1)
+
+        self.plan = oimObservablePlan(self)
         self._prepared = True
 
     def writeto(
@@ -2,10 +2,21 @@ from pathlib import Path
 import numpy as np
 from scipy import interpolate
 
+from .oimUtils import _gridCached, _gridKey
+
 fitzindeb = np.genfromtxt(Path(__file__).parent / 'extlaws' / 'FitzIndeb_3.1_VOSA.dat', unpack=True)
 fitzindebspline = interpolate.splrep(fitzindeb[0]/1e10, fitzindeb[1], s=1)
 
+# NOTE: The extinction curve is computed once per wavelength grid and then
+# only scaled by A_V
+_fitzindebKappa = {}
+
+
 def extlaw_FitzIndeb(wavelength, A_V=10.0):
 
-    kappa = interpolate.splev(wavelength, fitzindebspline, der=0)
-    return A_V * (kappa / 211.4)
\ No newline at end of file
+    kappa = _gridCached(
+        _fitzindebKappa,
+        _gridKey(wavelength),
+        lambda: interpolate.splev(wavelength, fitzindebspline, der=0) / 211.4,
+    )
+    return A_V * kappa
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """model fitting"""
-# from multiprocessing import Pool
+import os
+from multiprocessing import Pool
 
 import astropy.units as unit
 import corner
@@ -12,12 +13,124 @@ from dynesty import DynamicNestedSampler, NestedSampler
 from dynesty import plotting as dyplot
 from matplotlib import cm
 from scipy.optimize import least_squares, minimize
+from scipy.stats import qmc
+from scipy.spatial import cKDTree
 from tqdm import tqdm
 
 from .oimParam import oimParam
 from .oimSimulator import oimSimulator
 
 
+class _oimLogProbability:
+    """Picklable log-probability of the emcee and dynesty samplers.
+
+    It only holds a copy of the simulator (with the observable plan but
+    without the astropy tables of the data) so that it can be sent to
+    worker processes or saved in a checkpoint file and evaluated without
+    any other state. If reduced is True, the chi2r is used instead of the
+    chi2.
+    """
+
+    def __init__(self, simulator, dataTypes=None, chi2fact=1, reduced=False):
+        self.simulator = simulator
+        self.dataTypes = dataTypes
+        self.chi2fact = chi2fact
+        self.reduced = reduced
+        self.freeParams = list(simulator.getFreeParameters().values())
+        self.limits = [(parami.min, parami.max) for parami in self.freeParams]
+
+    def __call__(self, theta):
+        for (lower, upper), val in zip(self.limits, theta):
+            if not lower < val < upper:
+                return -np.inf
+
+        self.simulator.setFreeVector(theta)
+        self.simulator.compute(computeChi2=True, dataTypes=self.dataTypes)
+        if self.reduced:
+            return -0.5 * self.simulator.chi2r / self.chi2fact
+        return -0.5 * self.simulator.chi2 / self.chi2fact
+
+
+class _oimPriorTransform:
+    """Picklable transformation of the unit cube to the uniform priors
+    between the min and max of the free parameters (for dynesty)."""
+
+    def __init__(self, freeParams):
+        priors = np.array([(p.min, p.max) for p in freeParams], dtype=float)
+        self.lower = priors[:, 0]
+        self.width = priors[:, 1] - priors[:, 0]
+
+    def __call__(self, uniform_samples):
+        return self.lower + self.width * uniform_samples
+
+
+class _oimGridChi2r:
+    """Picklable computation of the chi2r of chunks of nodes of a regular
+    grid, used by oimFitterRegularGrid."""
+
+    def __init__(self, simulator, params, grid, dataTypes, chunkSize, dof):
+        self.simulator = simulator
+        self.params = params
+        self.grid = grid
+        self.dataTypes = dataTypes
+        self.chunkSize = chunkSize
+        self.dof = dof
+
+    def __call__(self, indices):
+        igrid = np.unravel_index(indices, [gi.size for gi in self.grid])
+        thetas = np.stack(
+            [gi[idx] for gi, idx in zip(self.grid, igrid)], axis=-1
+        )
+        chi2 = self.simulator.computeBatch(
+            thetas,
+            dataTypes=self.dataTypes,
+            chunkSize=self.chunkSize,
+            params=self.params,
+        )
+        return indices, chi2 / self.dof
+
+
+# NOTE: The function evaluated by the worker processes of a pool, sent once
+# when the pool is created
+_workerFunction = None
+
+
+def _initWorker(function):
+    global _workerFunction
+    _workerFunction = function
+
+
+def _callWorker(args):
+    return _workerFunction(args)
+
+
+class _oimLocalFit:
+    """Picklable local least-squares optimization from a starting point,
+    used by oimFitterMultiStart."""
+
+    def __init__(self, simulator, dataTypes, bounds, method="trf"):
+        self.simulator = simulator
+        self.dataTypes = dataTypes
+        self.bounds = bounds
+        self.method = method
+
+    def __call__(self, x0):
+        return least_squares(
+            self.simulator.computeResiduals,
+            x0,
+            bounds=self.bounds,
+            method=self.method,
+            kwargs={"dataTypes": self.dataTypes},
+        )
+
+
+def _imap(pool, function, iterable):
+    """Map a function on a user-given pool, unordered if possible."""
+    if hasattr(pool, "imap_unordered"):
+        return pool.imap_unordered(function, iterable)
+    return pool.map(function, iterable)
+
+
 class oimFitter:
     params = {}
     description = "Abstract class for model-fitting"
@@ -25,11 +138,20 @@ class oimFitter:
     def __init__(self, *args, **kwargs):
 
         self.cprior = kwargs.get("cprior", None)
+        linearParams = kwargs.pop("linearParams", None)
         nargs = len(args)
         if nargs == 2:
-            self.simulator = oimSimulator(args[0], args[1], cprior=self.cprior)
+            self.simulator = oimSimulator(
+                args[0],
+                args[1],
+                cprior=self.cprior,
+                cacheSize=kwargs.pop("cacheSize", 0),
+                linearParams=linearParams,
+            )
         elif nargs == 1:
             self.simulator = args[0]
+            if linearParams is not None:
+                self.simulator.linearParams = list(linearParams)
         else:
             raise TypeError("Wrong number of arguments")
 
@@ -49,7 +171,7 @@ class oimFitter:
         return kwargs
 
     def prepare(self, **kwargs):
-        self.freeParams = self.model.getFreeParameters()
+        self.freeParams = self.simulator.getFreeParameters()
         self.nfree = len(self.freeParams)
 
         self.limits = {}
@@ -75,6 +197,46 @@ class oimFitter:
     def getResults(self, **kwargs):
         return 0
 
+    def _setResultsFromJacobian(self, res):
+        """Set the free parameters to the solution of a least-squares
+        minimization, with errors from its Jacobian, and return them.
+
+        Parameters
+        ----------
+        res : scipy.optimize.OptimizeResult
+            The result of scipy.optimize.least_squares.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            The values of the free parameters.
+        errors : numpy.ndarray
+            Their errors.
+        """
+        values = res.x
+        jac = res.jac
+
+        # NOTE: The residuals are weighted by the errors so that the
+        # covariance matrix is the inverse of J^T.J
+        try:
+            cov = np.linalg.inv(jac.T.dot(jac))
+            errors = np.sqrt(np.abs(np.diagonal(cov)))
+        except np.linalg.LinAlgError:
+            errors = np.full(values.size, np.nan)
+
+        for iparam, parami in enumerate(self.freeParams.values()):
+            parami.value = values[iparam]
+            parami.error = errors[iparam]
+
+        self.simulator.compute(
+            computeChi2=True,
+            computeSimulatedData=True,
+            dataTypes=self.dataTypes,
+            cprior=self.cprior,
+        )
+
+        return values, errors
+
     def printResults(self, format=".5f", **kwargs):
         res = self.getResults(**kwargs)
         chi2r = self.simulator.chi2r
@@ -125,23 +287,60 @@ class oimFitterEmcee(oimFitter):
             ],
         )
 
+        # NOTE: With a pool the walkers are evaluated in other processes by
+        # a picklable log-probability. If the pool is created from nproc, the
+        # log-probability is sent once to each worker at the creation of the
+        # pool in the run method. Otherwise it is sent with each task.
+        self.pool = kwargs.pop("pool", None)
+        self.nproc = kwargs.pop("nproc", None)
+        logProbability = self._logProbability
+        if kwargs.get("vectorize", False):
+            # NOTE: All the walkers of a step are computed in a single
+            # batched call of the simulator, emcee does not use the pool
+            if self.pool is not None or (self.nproc or 1) > 1:
+                raise ValueError(
+                    "The vectorize option cannot be used with a pool or nproc"
+                )
+            logProbability = self._logProbabilityBatch
+        elif self.pool is not None or (self.nproc or 1) > 1:
+            self._workerLogProbability = _oimLogProbability(
+                self.simulator,
+                self.dataTypes,
+                self.params["chi2fact"].value,
+            )
+            if self.pool is not None:
+                logProbability = self._workerLogProbability
+            else:
+                logProbability = _callWorker
+
         samplerFile = kwargs.pop("samplerFile", None)
+        compression = kwargs.pop("compression", None)
+        resume = kwargs.pop("resume", True)
         if samplerFile is None:
             self.sampler = emcee.EnsembleSampler(
                 self.params["nwalkers"].value,
                 self.nfree,
-                self._logProbability,
+                logProbability,
                 moves=moves,
+                pool=self.pool,
                 **kwargs,
             )
         else:
-            backend = emcee.backends.HDFBackend(samplerFile)
+            # NOTE: Each step is written in the file so that a killed run can
+            # be resumed. Unless resume is False, an existing file is loaded
+            # and the run continues from its last step.
+            backend = emcee.backends.HDFBackend(
+                samplerFile, compression=compression
+            )
+            if not resume:
+                backend.reset(self.params["nwalkers"].value, self.nfree)
             self.sampler = emcee.EnsembleSampler(
                 self.params["nwalkers"].value,
                 self.nfree,
-                self._logProbability,
+                logProbability,
                 moves=moves,
                 backend=backend,
+                pool=self.pool,
                 **kwargs,
             )
         return kwargs
@@ -186,7 +385,20 @@ class oimFitterEmcee(oimFitter):
                 state = self.initialParams
             else:
                 state = None
-        self.sampler.run_mcmc(state, **kwargs)
+
+        if self.pool is None and (self.nproc or 1) > 1:
+            with Pool(
+                self.nproc,
+                initializer=_initWorker,
+                initargs=(self._workerLogProbability,),
+            ) as pool:
+                self.sampler.pool = pool
+                try:
+                    self.sampler.run_mcmc(state, **kwargs)
+                finally:
+                    self.sampler.pool = None
+        else:
+            self.sampler.run_mcmc(state, **kwargs)
         self.getResults()
 
         return kwargs
@@ -194,20 +406,45 @@ class oimFitterEmcee(oimFitter):
     # TODO: Maybe make it possible for end-user to input their own
     # parametrisation
     def _logProbability(self, theta):
-        for iparam, parami in enumerate(self.freeParams.values()):
-            parami.value = theta[iparam]
-
         for i, key in enumerate(self.freeParams):
             val = theta[i]
             lower, upper = self.limits[key]
             if not lower < val < upper:
                 return -np.inf
 
+        self.simulator.setFreeVector(theta)
+
         self.simulator.compute(
             computeChi2=True, dataTypes=self.dataTypes, cprior=self.cprior
         )
         return -0.5 * self.simulator.chi2/self.params["chi2fact"].value
 
+    def _logProbabilityBatch(self, thetas):
+        """Vectorized log-probability used with the vectorize option.
+
+        Parameters
+        ----------
+        thetas : numpy.ndarray
+            The positions of the walkers as an (nwalkers, nfree) array.
+
+        Returns
+        -------
+        logProbability : numpy.ndarray
+            The log-probability of each walker (-inf outside the limits).
+        """
+        thetas = np.atleast_2d(thetas)
+        lower, upper = np.array(list(self.limits.values()), dtype=float).T
+        inside = np.all((lower < thetas) & (thetas < upper), axis=1)
+
+        logProbability = np.full(thetas.shape[0], -np.inf)
+        if np.any(inside):
+            chi2 = self.simulator.computeBatch(
+                thetas[inside], dataTypes=self.dataTypes
+            )
+            chi2fact = self.params["chi2fact"].value
+            logProbability[inside] = -0.5 * chi2 / chi2fact
+        return logProbability
+
     def getResults(self, mode="best", discard=0, chi2limfact=20, **kwargs):
         chi2 = -2 * self.sampler.get_log_prob(discard=discard, flat=True)
         chain = self.sampler.get_chain(discard=discard, flat=True)
@@ -393,11 +630,31 @@ class oimFitterDynesty(oimFitter):
         super().__init__(*args, **kwargs)
         samplers = {"dynamic": DynamicNestedSampler, "static": NestedSampler}
         self.method = kwargs.pop("method", "dynamic")
-        self.sampler = samplers[self.method]
+        self._samplerClass = samplers[self.method]
+        self.sampler = self._samplerClass
 
     def _prepare(self, **kwargs):
-        """Prepares the dynesty fitter."""
-        samplerFile = kwargs.pop("samplerFile", None)
+        """Prepares the dynesty fitter.
+
+        If a samplerFile is given, the state of the sampler is saved in this
+        file every checkpointEvery seconds (default 60) during the run. With
+        resume=True, the sampler is restored from an existing samplerFile and
+        the run continues from the last checkpoint.
+
+        With nproc greater than one, a pool of processes is created by the
+        run method and the log-probability (with a copy of the simulator) is
+        sent once to each worker. queue_size (default nproc) points are then
+        proposed and evaluated in parallel. The pool is closed at the end of
+        the run.
+        """
+        # NOTE: dynesty only accepts file names given as strings
+        self.samplerFile = kwargs.pop("samplerFile", None)
+        if self.samplerFile is not None:
+            self.samplerFile = os.fspath(self.samplerFile)
+        self.checkpointEvery = kwargs.pop("checkpointEvery", 60)
+        self.resume = kwargs.pop("resume", False)
+        self.nproc = kwargs.pop("nproc", None)
+        self.queueSize = kwargs.pop("queue_size", self.nproc)
         sampler_kwargs = {
             "sample": kwargs.pop("sample", "rwalk"),
             "bound": kwargs.pop("bound", "multi"),
@@ -408,18 +665,36 @@ class oimFitterDynesty(oimFitter):
         if self.method != "dynamic":
             sampler_kwargs["nlive"] = kwargs.pop("nlive", 1000)
 
-        # TODO: Implement the loading of the sampler
-        if samplerFile is None:
-            self.sampler = self.sampler(
-                self._logProbability,
-                self._ptform,
+        # NOTE: The sampler is pickled in the checkpoint file, so that the
+        # log-probability and prior transform have to be picklable
+        self._workerLogProbability = _oimLogProbability(
+            self.simulator, self.dataTypes, reduced=True
+        )
+
+        # NOTE: Also set in the main process for the samplers restored from a
+        # run that used a pool
+        _initWorker(self._workerLogProbability)
+
+        if (
+            self.resume
+            and self.samplerFile is not None
+            and os.path.exists(self.samplerFile)
+        ):
+            self.sampler = self._samplerClass.restore(self.samplerFile)
+        else:
+            self.resume = False
+            self.sampler = self._samplerClass(
+                (
+                    _callWorker
+                    if (self.nproc or 1) > 1
+                    else self._workerLogProbability
+                ),
+                _oimPriorTransform(self.freeParams.values()),
                 self.nfree,
                 update_interval=self.nfree,
                 **sampler_kwargs,
                 **kwargs,
             )
-        else:
-            ...
 
         return kwargs
 
@@ -435,32 +710,44 @@ class oimFitterDynesty(oimFitter):
         else:
             run_kwargs = {"dlogz": kwargs.pop("dlogz", 0.01)}
 
-        # TODO: Implement checkpoint file here
-        self.sampler.run_nested(
-            print_progress=print_progress, **run_kwargs, **kwargs
-        )
+        if self.samplerFile is not None:
+            run_kwargs["checkpoint_file"] = self.samplerFile
+            run_kwargs["checkpoint_every"] = self.checkpointEvery
+            run_kwargs["resume"] = self.resume
+
+        if (self.nproc or 1) > 1:
+            with Pool(
+                self.nproc,
+                initializer=_initWorker,
+                initargs=(self._workerLogProbability,),
+            ) as pool:
+                self._setPool(pool, self.queueSize)
+                try:
+                    self.sampler.run_nested(
+                        print_progress=print_progress, **run_kwargs, **kwargs
+                    )
+                finally:
+                    self._setPool(None, 1)
+        else:
+            self.sampler.run_nested(
+                print_progress=print_progress, **run_kwargs, **kwargs
+            )
         self.getResults()
         return kwargs
 
-    # TODO: Maybe make it possible for end-user to input their own
-    # parametrisation
-    def _ptform(self, uniform_samples: np.ndarray) -> np.ndarray:
-        """The transformation for uniform sampled values to the
-        uniform parameter space."""
-        priors = np.array(
-            [(param.min, param.max) for param in self.freeParams.values()]
-        )
-        return priors[:, 0] + (priors[:, 1] - priors[:, 0]) * uniform_samples
-
-    def _logProbability(self, theta: np.ndarray) -> float:
-        """The log probability."""
-        for iparam, parami in enumerate(self.freeParams.values()):
-            parami.value = theta[iparam]
-
-        self.simulator.compute(
-            computeChi2=True, dataTypes=self.dataTypes, cprior=self.cprior
-        )
-        return -0.5 * self.simulator.chi2r
+    def _setPool(self, pool, queue_size):
+        """Set the pool of the sampler and of its internal samplers (as in
+        dynesty.utils.restore_sampler)."""
+        samplers = [
+            self.sampler,
+            getattr(self.sampler, "sampler", None),
+            getattr(self.sampler, "batch_sampler", None),
+        ]
+        for sampler in samplers:
+            if sampler is not None:
+                sampler.pool = pool
+                sampler.mapper = map if pool is None else pool.map
+                sampler.queue_size = queue_size
 
     def getResults(self, mode="median", **kwargs):
         if mode == "median":
@@ -602,8 +889,6 @@ class oimFitterMinimize(oimFitter):
     def _run(self, **kwargs):
 
         self.res = minimize(self._getChi2r, self.initialParams, **kwargs)
-        # self.res = least_squares(self._getChi2r, self.initialParams,method=
-        #                         self.params["method"].value)
         self.getResults()
         return kwargs
 
@@ -640,6 +925,188 @@ class oimFitterMinimize(oimFitter):
         print(f"chi2r = {chi2r:{format}}")
 
 
+class oimFitterLeastSquares(oimFitter):
+    description = (
+        "a Levenberg-Marquardt or Trust Region Reflective least-squares"
+        " fitter based on the scipy least_squares function"
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.params["method"] = oimParam(
+            name="method",
+            value="trf",
+            mini=1,
+            description="least-squares method: trf, dogbox or lm",
+        )
+
+        super().__init__(*args, **kwargs)
+
+    def _prepare(self, **kwargs):
+        self.initialParams = kwargs.pop(
+            "initialParams",
+            [parami.value for parami in self.freeParams.values()],
+        )
+        return kwargs
+
+    def _getResiduals(self, theta):
+        return self.simulator.computeResiduals(theta, dataTypes=self.dataTypes)
+
+    def _run(self, **kwargs):
+        method = self.params["method"].value
+
+        # NOTE: The Levenberg-Marquardt method doesn't support bounds
+        if method != "lm":
+            kwargs.setdefault(
+                "bounds", np.array(list(self.limits.values())).T
+            )
+
+        self.res = least_squares(
+            self._getResiduals, self.initialParams, method=method, **kwargs
+        )
+        self.getResults()
+        return kwargs
+
+    def getResults(self, **kwargs):
+        return self._setResultsFromJacobian(self.res)
+
+
+class oimFitterMultiStart(oimFitter):
+    description = (
+        "local least-squares minimizations from many starting points"
+        r" within the parameters bounds, ranked by their :math:`\chi^2_r`"
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.params["nstarts"] = oimParam(
+            name="nstarts",
+            value=16,
+            mini=1,
+            description="Number of starting points",
+        )
+        self.params["method"] = oimParam(
+            name="method",
+            value="trf",
+            mini=1,
+            description="least-squares method: trf or dogbox",
+        )
+
+        super().__init__(*args, **kwargs)
+
+    def _prepare(self, **kwargs):
+        """Draw the starting points within the min and max of the free
+        parameters.
+
+        Parameters
+        ----------
+        init : str, optional
+            "random" (default) for uniformly distributed points, "lhs" for a
+            Latin hypercube sampling, or "grid" for the centers of the cells
+            of a regular grid with ceil(nstarts**(1/nfree)) cells along each
+            parameter.
+        """
+        init = kwargs.pop("init", "random")
+        nstarts = self.params["nstarts"].value
+
+        lower, upper = np.array(list(self.limits.values()), dtype=float).T
+        if not (np.all(np.isfinite(lower)) and np.all(np.isfinite(upper))):
+            raise ValueError(
+                "The min and max of all the free parameters should be finite"
+            )
+
+        if init == "random":
+            unit = np.random.random((nstarts, self.nfree))
+        elif init == "lhs":
+            sampler = qmc.LatinHypercube(
+                d=self.nfree, seed=np.random.randint(2**32)
+            )
+            unit = sampler.random(nstarts)
+        elif init == "grid":
+            ncells = int(np.ceil(nstarts ** (1 / self.nfree) - 1e-9))
+            centers = [(np.arange(ncells) + 0.5) / ncells] * self.nfree
+            unit = np.stack(
+                [g.ravel() for g in np.meshgrid(*centers, indexing="ij")],
+                axis=-1,
+            )
+        else:
+            raise NameError(
+                "'init' should be either 'random', 'lhs' or 'grid'"
+            )
+
+        self.initialParams = lower + (upper - lower) * unit
+        return kwargs
+
+    def _run(self, **kwargs):
+        """Run the local minimizations.
+
+        Parameters
+        ----------
+        nproc : int, optional
+            The number of processes used to run the minimizations
+            concurrently. The default is None (no parallelization).
+        progress : bool, optional
+            If True, show a progress bar. The default is True.
+        """
+        nproc = kwargs.pop("nproc", None)
+        progress = kwargs.pop("progress", True)
+
+        localFit = _oimLocalFit(
+            self.simulator,
+            self.dataTypes,
+            np.array(list(self.limits.values()), dtype=float).T,
+            self.params["method"].value,
+        )
+
+        if (nproc or 1) > 1:
+            with Pool(
+                nproc, initializer=_initWorker, initargs=(localFit,)
+            ) as pool:
+                results = list(
+                    tqdm(
+                        pool.imap(_callWorker, self.initialParams),
+                        total=len(self.initialParams),
+                        disable=not progress,
+                    )
+                )
+        else:
+            results = [
+                localFit(x0)
+                for x0 in tqdm(self.initialParams, disable=not progress)
+            ]
+
+        # NOTE: Ranking the solutions by increasing chi2r
+        self.simulator.compute(computeChi2=True, dataTypes=self.dataTypes)
+        dof = self.simulator.nelChi2 - self.model.getNFree()
+        chi2r = np.array([2 * res.cost / dof for res in results])
+        order = np.argsort(chi2r)
+
+        self.results = [results[i] for i in order]
+        self.startParams = self.initialParams[order]
+        self.solutions = np.array([res.x for res in self.results])
+        self.solutionsChi2r = chi2r[order]
+
+        self.getResults()
+        return kwargs
+
+    def getResults(self, rank=0, **kwargs):
+        """Set the free parameters to a solution and return it.
+
+        Parameters
+        ----------
+        rank : int, optional
+            The rank of the solution (0 for the lowest chi2r). The default
+            is 0.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            The values of the free parameters.
+        errors : numpy.ndarray
+            Their errors from the Jacobian of the local minimization.
+        """
+        self.res = self.results[rank]
+        return self._setResultsFromJacobian(self.res)
+
+
 class oimFitterRegularGrid(oimFitter):
     description = r"regular grid with :math:`\chi^2` explorer"
 
@@ -652,7 +1119,7 @@ class oimFitterRegularGrid(oimFitter):
         if "params" in kwargs:
             self.gridParams = kwargs["params"]
         else:
-            self.gridParams = list(self.model.getFreeParameters().values())
+            self.gridParams = list(self.simulator.getFreeParameters().values())
 
         if "max" in kwargs:
             self.gridMax = kwargs["max"]
@@ -695,24 +1162,137 @@ class oimFitterRegularGrid(oimFitter):
 
         return kwargs
 
+    def _initMap(self, mapFile, resume):
+        """Create the chi2rMap (or reuse it if resume is True). The nodes
+        that are not computed yet are set to NaN."""
+        shape = tuple(self.gridSize)
+        if mapFile is not None:
+            if resume and os.path.exists(mapFile):
+                chi2rMap = np.lib.format.open_memmap(mapFile, mode="r+")
+                if chi2rMap.shape == shape:
+                    return chi2rMap
+            chi2rMap = np.lib.format.open_memmap(
+                mapFile, mode="w+", dtype=float, shape=shape
+            )
+            chi2rMap[...] = np.nan
+            return chi2rMap
+
+        chi2rMap = getattr(self, "chi2rMap", None)
+        if resume and chi2rMap is not None and chi2rMap.shape == shape:
+            return chi2rMap
+        return np.full(shape, np.nan)
+
     def _run(self, **kwargs):
-        self.chi2rMap = np.zeros(self.gridSize)
+        """Compute the chi2r on all the nodes of the grid.
+
+        The nodes are computed by chunks, either in a single batched call of
+        the simulator per chunk (see oimSimulator.computeBatch) or in a pool
+        of processes.
+
+        Parameters
+        ----------
+        chunkSize : int, optional
+            The number of nodes computed at once. The default is chosen so
+            that a chunk contains about one million observables.
+        nproc : int, optional
+            The number of processes used to compute the chunks. The default
+            is None (no parallelization).
+        pool : optional
+            An existing pool (with a map or imap_unordered method) used
+            instead of creating one from nproc.
+        mapFile : str, optional
+            A .npy file in which the chi2rMap is memory-mapped. The default
+            is None (the chi2rMap is kept in memory).
+        resume : bool, optional
+            If True, only the nodes that were not computed in a previous
+            (interrupted) run, i.e. the NaN of the chi2rMap or of the
+            mapFile, are computed. The default is False.
+        progress : bool, optional
+            If True, show a progress bar. The default is True.
+        """
+        mapFile = kwargs.pop("mapFile", None)
+        resume = kwargs.pop("resume", False)
+        progress = kwargs.pop("progress", True)
+
+        self.chi2rMap = self._initMap(mapFile, resume)
+        pending = np.flatnonzero(np.isnan(self.chi2rMap.ravel()))
+
+        kwargs = self._startWorkers(**kwargs)
+        try:
+            self._computeNodes(pending, progress)
+        finally:
+            self._stopWorkers()
+            if isinstance(self.chi2rMap, np.memmap):
+                self.chi2rMap.flush()
 
-        n = self.chi2rMap.size
+        return kwargs
 
-        for i in tqdm(range(n)):
-            igrid = np.unravel_index(i, self.gridSize)
-            for iparam in range(len(igrid)):
-                self.gridParams[iparam].value = self.grid[iparam][
-                    igrid[iparam]
-                ]
-            self.simulator.compute(computeChi2=True, dataTypes=self.dataTypes)
-            self.chi2rMap[igrid] = self.simulator.chi2r
+    def _startWorkers(self, **kwargs):
+        """Create the computation of the chi2r of the nodes and, if nproc is
+        greater than one, the pool of processes."""
+        chunkSize = kwargs.pop("chunkSize", None)
+        nproc = kwargs.pop("nproc", None)
+        self._pool = kwargs.pop("pool", None)
+
+        # NOTE: Also gives the number of observables of the chi2
+        self.simulator.compute(computeChi2=True, dataTypes=self.dataTypes)
+        dof = self.simulator.nelChi2 - self.model.getNFree()
+
+        if chunkSize is None:
+            chunkSize = max(1, 2**20 // max(self.data.plan.size, 1))
+        self._chunkSize = chunkSize
+
+        self._gridChi2r = _oimGridChi2r(
+            self.simulator,
+            self.gridParams,
+            self.grid,
+            self.dataTypes,
+            chunkSize,
+            dof,
+        )
+
+        self._ownPool = self._pool is None and (nproc or 1) > 1
+        if self._ownPool:
+            self._pool = Pool(
+                nproc, initializer=_initWorker, initargs=(self._gridChi2r,)
+            )
         return kwargs
 
+    def _stopWorkers(self):
+        if self._ownPool:
+            self._pool.terminate()
+        self._pool = None
+
+    def _computeNodes(self, indices, progress=True):
+        """Compute the chi2r of the given (flat) indices of nodes by chunks
+        and write them in the chi2rMap."""
+        chunkSize = self._chunkSize
+        chunks = [
+            indices[start : start + chunkSize]
+            for start in range(0, indices.size, chunkSize)
+        ]
+
+        if self._ownPool:
+            results = self._pool.imap_unordered(_callWorker, chunks)
+        elif self._pool is not None:
+            results = _imap(self._pool, self._gridChi2r, chunks)
+        else:
+            results = map(self._gridChi2r, chunks)
+
+        # NOTE: The results are written in the chi2rMap as soon as a chunk
+        # is computed so that an interrupted run can be resumed
+        with tqdm(total=indices.size, disable=not progress) as pbar:
+            for indicesi, chi2r in results:
+                self.chi2rMap.flat[indicesi] = chi2r
+                pbar.update(indicesi.size)
+
+    def _getBestIndex(self):
+        """Return the flat index of the node with the minimum chi2r."""
+        return np.nanargmin(self.chi2rMap)
+
     def getResults(self, **kwargs):
 
-        idx_best = np.unravel_index(np.argmin(self.chi2rMap), self.gridSize)
+        idx_best = np.unravel_index(self._getBestIndex(), self.gridSize)
 
         best = []
         for iparam in range(len(idx_best)):
@@ -910,3 +1490,110 @@ class oimFitterRegularGrid(oimFitter):
             fig.colorbar(sm, ax=ax, label="$\\chi^2_r$")
 
         return fig, ax
+
+
+class oimFitterAdaptiveGrid(oimFitterRegularGrid):
+    description = r"coarse-to-fine adaptive grid with :math:`\chi^2` explorer"
+
+    def _run(self, **kwargs):
+        """Compute the chi2r on an adaptive grid.
+
+        The grid defined by the min, max and steps options is first computed
+        with a stride of coarseStep nodes along each dimension. The stride is
+        then halved until the final resolution is reached, refining at each
+        level only the neighborhood of the nodes whose chi2r is lower than
+        threshold times the minimum chi2r.
+
+        The computed nodes are stored in chi2rMapSparse (NaN for the nodes
+        not computed) and chi2rMap contains the map resampled on all the
+        nodes of the grid with the value of the nearest computed node, so
+        that it can be plotted with plotMap.
+
+        Parameters
+        ----------
+        coarseStep : int, optional
+            The initial stride in number of nodes, rounded to a power of
+            two. The default is chosen to have at least four nodes along
+            each dimension.
+        threshold : float, optional
+            The cells around the nodes with chi2r < threshold*min(chi2r) are
+            refined. The default is 2.
+        chunkSize, nproc, pool, progress :
+            See oimFitterRegularGrid.run.
+        """
+        coarseStep = kwargs.pop("coarseStep", None)
+        threshold = kwargs.pop("threshold", 2)
+        progress = kwargs.pop("progress", True)
+
+        gridSize = np.array(self.gridSize)
+        if coarseStep is None:
+            coarseStep = max(gridSize.min() // 4, 1)
+        step = 2 ** int(np.log2(max(coarseStep, 1)))
+
+        self.chi2rMap = np.full(self.gridSize, np.nan)
+
+        kwargs = self._startWorkers(**kwargs)
+        try:
+            # NOTE: The coarse grid includes the last node of each dimension
+            axes = [
+                np.union1d(np.arange(0, ni, step), [ni - 1]) for ni in gridSize
+            ]
+            nodes = np.stack(
+                [g.ravel() for g in np.meshgrid(*axes, indexing="ij")], axis=-1
+            )
+            self._computeNodes(
+                np.ravel_multi_index(nodes.T, self.gridSize), progress
+            )
+
+            while step > 1:
+                chi2r = self.chi2rMap.ravel()
+                lattice = np.all(
+                    (nodes % step == 0) | (nodes == gridSize - 1), axis=1
+                )
+                nodes = nodes[lattice]
+                flat = np.ravel_multi_index(nodes.T, self.gridSize)
+                selected = nodes[
+                    chi2r[flat] <= threshold * np.nanmin(self.chi2rMap)
+                ]
+
+                step //= 2
+                offsets = np.arange(-2 * step, 2 * step + 1, step)
+                offsets = np.stack(
+                    [
+                        g.ravel()
+                        for g in np.meshgrid(
+                            *[offsets] * len(self.gridSize), indexing="ij"
+                        )
+                    ],
+                    axis=-1,
+                )
+                nodes = np.clip(
+                    (selected[:, None, :] + offsets[None, :, :]).reshape(
+                        -1, len(self.gridSize)
+                    ),
+                    0,
+                    gridSize - 1,
+                )
+                flat = np.unique(np.ravel_multi_index(nodes.T, self.gridSize))
+                self._computeNodes(flat[np.isnan(chi2r[flat])], progress)
+                nodes = np.stack(np.unravel_index(flat, self.gridSize), -1)
+        finally:
+            self._stopWorkers()
+
+        # NOTE: Resampling on the full grid with the nearest computed node
+        self.chi2rMapSparse = self.chi2rMap
+        computed = np.flatnonzero(~np.isnan(self.chi2rMapSparse))
+        self.nComputed = computed.size
+        points = np.stack(np.unravel_index(computed, self.gridSize), -1)
+        allPoints = np.stack(
+            np.unravel_index(np.arange(self.chi2rMap.size), self.gridSize), -1
+        )
+        _, nearest = cKDTree(points).query(allPoints)
+        self.chi2rMap = np.reshape(
+            self.chi2rMapSparse.ravel()[computed[nearest]], self.gridSize
+        )
+
+        return kwargs
+
+    def _getBestIndex(self):
+        return np.nanargmin(self.chi2rMapSparse)
@@ -15,6 +15,7 @@ from numpy.typing import ArrayLike
 from .oimComponent import oimComponent
 from .oimParam import (
     oimParam,
+    oimParamEvaluation,
     oimParamInterpolator,
     oimParamLinker,
     oimParamNorm,
@@ -47,6 +48,7 @@ class oimModel:
             self.components = components[0]
         else:
             self.components = components
+        self._registry = None
 
     def __str__(self):
         """Return a string representation of the model"""
@@ -74,6 +76,7 @@ class oimModel:
         vcoord: ArrayLike,
         wl: Optional[ArrayLike] = None,
         t: Optional[ArrayLike] = None,
+        cache: Optional[bool] = True,
     ) -> np.ndarray:
         """Compute and return the complex coherent flux for an array of u,v
         (and optionally wavelength and time) coordinates.
@@ -88,15 +91,30 @@ class oimModel:
             Wavelength(s) in meter. The default is None.
         t :  array_like, optional
             Time in s (mjd). The default is None.
+        cache : bool, optional
+            If True, the components with unchanged parameters and coordinates
+            reuse their last complex coherent flux, and keep the new one.
+            The default is True.
 
         Returns
         -------
         numpy.ndarray
             The complex coherent flux. The same size as u & v
         """
-        res = complex(0, 0)
-        for component in self.components:
-            res += component.getComplexCoherentFlux(ucoord, vcoord, wl, t)
+        # NOTE: Linked, normalized and interpolated parameters are evaluated
+        # once for all the components
+        with oimParamEvaluation(wl, t):
+            vcs = [
+                (
+                    component.getCachedComplexCoherentFlux
+                    if cache
+                    else component.getComplexCoherentFlux
+                )(ucoord, vcoord, wl, t)
+                for component in self.components
+            ]
+        res = np.zeros(np.broadcast_shapes(*map(np.shape, vcs)), complex)
+        for vc in vcs:
+            res += vc
         return res
 
     def getParameters(
@@ -115,36 +133,10 @@ class oimModel:
         params : Dict of oimParam
             Dictionary of the model's parameters (or free parameters).
         """
-        params = {}
-        for i, component in enumerate(self.components):
-            for name, param in component.params.items():
-                if param not in params.values():
-                    if isinstance(param, oimParamInterpolator):
-                        for iparam, parami in enumerate(param.params):
-                            if parami not in params.values():
-                                if parami.free or not free:
-                                    params[
-                                        "c{0}_{1}_{2}_interp{3}".format(
-                                            i + 1,
-                                            component.shortname.replace(
-                                                " ", "_"
-                                            ),
-                                            name,
-                                            iparam + 1,
-                                        )
-                                    ] = parami
-                    elif isinstance(param, oimParamLinker):
-                        pass
-                    else:
-                        if param.free or not free:
-                            params[
-                                "c{0}_{1}_{2}".format(
-                                    i + 1,
-                                    component.shortname.replace(" ", "_"),
-                                    name,
-                                )
-                            ] = param
-        return params
+        registry = self._getRegistry()
+        if free:
+            return dict(registry["free"])
+        return dict(registry["all"])
 
     def getFreeParameters(self) -> Dict[str, oimParam]:
         """Get the Model free paramters
@@ -156,6 +148,98 @@ class oimModel:
         """
         return self.getParameters(free=True)
 
+    def getFreeVector(self) -> np.ndarray:
+        """Get the values of the free parameters as a contiguous vector.
+
+        Returns
+        -------
+        numpy.ndarray
+            The values of the free parameters in the order of
+            getFreeParameters().
+        """
+        return np.array(
+            [parami.value for parami in self._getRegistry()["freeList"]],
+            dtype=float,
+        )
+
+    def setFreeVector(self, theta: ArrayLike) -> None:
+        """Set the values of the free parameters from a vector.
+
+        Parameters
+        ----------
+        theta : array_like
+            The values of the free parameters in the order of
+            getFreeParameters().
+        """
+        freeList = self._getRegistry()["freeList"]
+        theta = np.asarray(theta, dtype=float)
+        if theta.shape != (len(freeList),):
+            raise ValueError(
+                f"Expected a vector of {len(freeList)} free parameters,"
+                f" got shape {theta.shape}"
+            )
+        for parami, thetai in zip(freeList, theta.tolist()):
+            parami.value = thetai
+
+    def getNFree(self) -> int:
+        """Return the number of free parameters of the model."""
+        return len(self._getRegistry()["freeList"])
+
+    def clearRegistry(self) -> None:
+        """Force the rebuilding of the parameter registry on next access.
+
+        NOTE: The registry is automatically rebuilt when the components, the
+        parameters of the components or the free flags change. This is only
+        needed if a component shortname, the dictionary of parameters of a
+        component or the parameters of an interpolator are replaced.
+        """
+        self._registry = None
+
+    def _getRegistry(self) -> Dict:
+        """Return the cached parameter registry, rebuilding it if the
+        components changed, or if a free flag or a parameter of any component
+        changed, since the last call."""
+        components = tuple(self.components)
+        version = oimParam._structureVersion
+        registry = getattr(self, "_registry", None)
+        if (
+            registry is not None
+            and registry["version"] == version
+            and registry["components"] == components
+        ):
+            return registry
+
+        # NOTE: Parameters shared between components are registered once,
+        # under their first name
+        params, seen = {}, set()
+        for i, component in enumerate(self.components):
+            prefix = "c{0}_{1}_".format(
+                i + 1, component.shortname.replace(" ", "_")
+            )
+            for name, param in component.params.items():
+                if isinstance(param, oimParamInterpolator):
+                    for iparam, parami in enumerate(param.params):
+                        if id(parami) not in seen:
+                            seen.add(id(parami))
+                            params[f"{prefix}{name}_interp{iparam + 1}"] = (
+                                parami
+                            )
+                elif isinstance(param, oimParamLinker):
+                    pass
+                elif id(param) not in seen:
+                    seen.add(id(param))
+                    params[f"{prefix}{name}"] = param
+
+        free = {key: parami for key, parami in params.items() if parami.free}
+        self._registry = {
+            "version": version,
+            "components": components,
+            "all": params,
+            "free": free,
+            "freeList": list(free.values()),
+        }
+        return self._registry
+
     def getImage(
         self,
         dim: int,
@@ -167,6 +251,7 @@ class oimModel:
         padFact: Optional[int] = 1,
         squeeze: Optional[bool] = True,
         normalize: Optional[bool] = False,
+        dtype: Optional[np.dtype] = float,
     ) -> Union[np.ndarray, PrimaryHDU]:
         """Compute and return an image or and image cube (if wavelength and time
         are given).
@@ -199,6 +284,9 @@ class oimModel:
             The default is True.
         normalize: bool, optional
             If True normalizes the image.
+        dtype : numpy.dtype, optional
+            Data type of the returned image. Use numpy.float32 to halve the
+            memory of large image cubes. The default is float.
 
         Returns
         -------
@@ -223,19 +311,25 @@ class oimModel:
         dimspad = (nt, nwl, dimpad, dimpad)
         if fromFT:
             v = np.linspace(-0.5 * padFact, 0.5 * padFact, dimpad)
+            v = v / pixSize / u.mas.to(u.rad)
             vx, vy = np.meshgrid(v, v)
 
-            vx_arr = np.tile(vx[None, None, :, :], (nt, nwl, 1, 1))
-            vy_arr = np.tile(vy[None, None, :, :], (nt, nwl, 1, 1))
-            wl_arr = np.tile(wl[None, :, None, None], (nt, 1, dimpad, dimpad))
-            t_arr = np.tile(t[:, None, None, None], (1, nwl, dimpad, dimpad))
-
-            spfx_arr = (vx_arr / pixSize / u.mas.to(u.rad)).flatten()
-            spfy_arr = (vy_arr / pixSize / u.mas.to(u.rad)).flatten()
-            wl_arr, t_arr = map(lambda x: x.flatten(), [wl_arr, t_arr])
+            # NOTE: The complex coherent flux needs flat coordinates, they are
+            # copied only once from views broadcast to the padded image cube
+            spfx_arr, spfy_arr, wl_arr, t_arr = map(
+                lambda x: x.reshape(-1),
+                np.broadcast_arrays(
+                    vx[None, None, :, :],
+                    vy[None, None, :, :],
+                    wl[None, :, None, None],
+                    t[:, None, None, None],
+                ),
+            )
 
+            # NOTE: The complex coherent fluxes of the image grid are not
+            # kept by the components
             ft = self.getComplexCoherentFlux(
-                spfx_arr, spfy_arr, wl_arr, t_arr
+                spfx_arr, spfy_arr, wl_arr, t_arr, cache=False
             ).reshape(dimspad)
             image = np.abs(
                 np.fft.fftshift(
@@ -250,15 +344,14 @@ class oimModel:
             image = image.reshape((nt, nwl, dim, padFact, dim, padFact)).sum(
                 axis=(-1, -3)
             )
+            image = image.astype(dtype, copy=False)
         else:
-            image = np.zeros(dims)
+            image = np.zeros(dims, dtype=dtype)
             for component in self.components:
                 image += component.getImage(dim, pixSize, wl, t)
 
         if normalize:
-            for it in range(nt):
-                for iwl in range(nwl):
-                    image[it, iwl, :, :] /= np.max(image[it, iwl, :, :])
+            image /= np.max(image, axis=(-2, -1), keepdims=True)
 
         # Always squeeze dim which are equal to one if exported to fits format
         if squeeze or toFits:
@@ -634,11 +727,11 @@ class oimModel:
 
         if not swapAxes:
             ft = self.getComplexCoherentFlux(
-                spfx_arr, spfy_arr, wl_arr, t_arr
+                spfx_arr, spfy_arr, wl_arr, t_arr, cache=False
             ).reshape(dims)
         else:
             ft = self.getComplexCoherentFlux(
-                spfx_arr, spfy_arr, t_arr, wl_arr
+                spfx_arr, spfy_arr, t_arr, wl_arr, cache=False
             ).reshape(dims)
 
         if display_mode == "vis":
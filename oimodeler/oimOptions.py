@@ -19,7 +19,17 @@ fftw = SimpleNamespace(initialized=False)
 ft = SimpleNamespace(backend=backend, binning=None, padding=4, fftw=fftw)
 
 grid = SimpleNamespace(type="linear")
-model = SimpleNamespace(grid=grid)
+
+# NOTE: Evaluation of the Bessel functions of the radially symmetric Fourier
+# components. If unique is True, they are computed on the unique arguments
+# only. If table is True, they are linearly interpolated in precomputed tables
+# up to xmax, with an absolute error on the normalized terms (equal to 1 at
+# zero frequency) lower than tolerance
+bessel = SimpleNamespace(unique=False, table=False, tolerance=1e-6, xmax=100)
+
+# NOTE: If True, the interpolated parameters are computed on the unique
+# wavelengths and times of a model evaluation only
+model = SimpleNamespace(grid=grid, uniqueParams=True, bessel=bessel)
 
 # NOTE: The dictionary oimOption contains all the customizable option
 # of `oimodeler`.
@@ -7,7 +7,6 @@ import pickle
 import operator
 import sys
 import inspect
-from functools import reduce
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
@@ -17,6 +16,7 @@ from numpy.typing import ArrayLike
 from scipy.interpolate import interp1d
 
 from .oimOptions import constants as const
+from .oimOptions import oimOptions
 from .oimUtils import blackbody, linear_to_angular, load_toml
 
 _standardParameters: Dict[str, Any] = load_toml(
@@ -44,6 +44,146 @@ _operators = {
 }
 
 
+class oimParamEvaluation:
+    """Context in which the parameters are evaluated only once for a given
+    set of wavelengths and times.
+
+    Within the context, the values returned by linkers, normalizers and
+    interpolators called with the wl and t arrays of the context are stored
+    and reused, so that parameters shared between components or called
+    several times by a component (and all the parameters they depend on) are
+    only computed once per model evaluation. Calls with other coordinates
+    are computed as usual.
+
+    Example :
+
+    .. code-block:: python
+
+        with oimParamEvaluation(wl, t):
+            vc = component.getComplexCoherentFlux(u, v, wl, t)
+
+    Interpolators are computed on the unique (wl, t) pairs only and their
+    values are broadcast back to the shape of the wl and t arrays, as the
+    data coordinates repeat the same wavelengths and times for all the
+    baselines.
+
+    Parameters
+    ----------
+    wl : numpy.ndarray, optional
+        The wavelengths of the evaluation. The default is None.
+    t : numpy.ndarray, optional
+        The times of the evaluation. The default is None.
+    """
+
+    current = None
+
+    # NOTE: The unique decomposition of the last wl and t arrays (compared by
+    # identity) is kept as models are evaluated many times on the same data
+    _lastUnique = None
+
+    def __init__(self, wl=None, t=None):
+        self.wl = wl
+        self.t = t
+        self.values = {}
+        self._previous = None
+        self._unique = None
+
+    def __enter__(self):
+        self._previous = oimParamEvaluation.current
+        oimParamEvaluation.current = self
+        return self
+
+    def __exit__(self, *exc):
+        oimParamEvaluation.current = self._previous
+        self._previous = None
+        return False
+
+    def getUnique(self):
+        """Return the unique (wl, t) pairs of the evaluation.
+
+        Returns
+        -------
+        tuple of numpy.ndarray or None
+            The wavelengths and times (None if t is None) of the unique pairs
+            and the indices broadcasting them back to the shape of wl. None if
+            wl and t are not arrays of the same shape or have no duplicates.
+        """
+        if self._unique is None:
+            cache = oimParamEvaluation._lastUnique
+            if (
+                cache is not None
+                and cache[0] is self.wl
+                and cache[1] is self.t
+            ):
+                self._unique = cache[2]
+            else:
+                self._unique = self._computeUnique()
+                oimParamEvaluation._lastUnique = (
+                    self.wl,
+                    self.t,
+                    self._unique,
+                )
+        return self._unique or None
+
+    def _computeUnique(self):
+        wl, t = self.wl, self.t
+        if not isinstance(wl, np.ndarray) or wl.ndim == 0:
+            return False
+        if t is not None and (
+            not isinstance(t, np.ndarray) or t.shape != wl.shape
+        ):
+            return False
+
+        uwl, iwl = np.unique(wl, return_inverse=True)
+        if t is None:
+            uwlt, ut, inverse = uwl, None, iwl
+        else:
+            ut, it = np.unique(t, return_inverse=True)
+            codes, inverse = np.unique(
+                iwl.ravel() * ut.size + it.ravel(), return_inverse=True
+            )
+            uwlt, ut = uwl[codes // ut.size], ut[codes % ut.size]
+
+        if uwlt.size == wl.size:
+            return False
+        return uwlt, ut, inverse.reshape(wl.shape)
+
+
+def _evaluate(param, function, wl, t, unique=False):
+    """Call function(wl, t) or return the value already computed for the
+    param in the current oimParamEvaluation context.
+
+    If unique is True, the function is computed on the unique (wl, t) pairs
+    of the context and broadcast back.
+    """
+    context = oimParamEvaluation.current
+    if context is None or wl is not context.wl or t is not context.t:
+        return function(wl, t)
+
+    # NOTE: The parameters are alive during the evaluation so that their id
+    # can be used as a key
+    key = id(param)
+    if key in context.values:
+        return context.values[key]
+
+    decomposition = None
+    if unique and oimOptions.model.uniqueParams:
+        decomposition = context.getUnique()
+    if decomposition is None:
+        value = function(wl, t)
+    else:
+        uwl, ut, inverse = decomposition
+        value = function(uwl, ut)
+        if np.ndim(value) != 0:
+            if np.shape(value)[-1:] == uwl.shape:
+                value = value[..., inverse]
+            else:
+                # NOTE: Not an elementwise function of wl and t
+                value = function(wl, t)
+    context.values[key] = value
+    return value
+
+
 class oimParam:
     """Class of model parameters.
 
@@ -67,6 +207,11 @@ class oimParam:
         The error of the parameter. The default is 0.
     """
 
+    # NOTE: Incremented when the free flag of a parameter changes or when a
+    # parameter of a component is added, replaced or removed, so that the
+    # models know that their parameter registry has to be rebuilt
+    _structureVersion = 0
+
     def __init__(
         self,
         name: Union[str, None] = None,
@@ -84,14 +229,26 @@ class oimParam:
         self.error = error
         self.min = mini
         self.max = maxi
-        self.free = free
+        self._free = free
         self.description = description
         self.unit = unit
 
+    @property
+    def free(self) -> bool:
+        """Gets if the parameter is to be fitted."""
+        return self._free
+
+    @free.setter
+    def free(self, value: bool) -> None:
+        """Sets if the parameter is to be fitted."""
+        if value != getattr(self, "_free", None):
+            oimParam._structureVersion += 1
+        self._free = value
+
     def set(self, **kwargs):
         for key, value in kwargs.items():
             try:
-                self.__dict__[key] = value
+                setattr(self, key, value)
             except NameError:
                 print("Note valid parameter : {}".format(value))
 
@@ -138,7 +295,7 @@ class oimParam:
     def deserialize(ser):
         p = oimParam()
         for key, val in ser.items():
-            p.__dict__[key] = val
+            setattr(p, key, val)
         return p
 
     def unpickle(f, openfile=True):
@@ -197,14 +354,15 @@ class oimParamLinker:
         return self.param.unit
 
     def __call__(self, wl=None, t=None):
-        values = [
-            self.param(wl, t),
-            *[
-                val(wl, t) if isinstance(val, oimParam) else val
-                for val in self.fact
-            ],
-        ]
-        return reduce(self.op, values)
+        return _evaluate(self, self._call, wl, t)
+
+    def _call(self, wl, t):
+        res = self.param(wl, t)
+        for val in self.fact:
+            if isinstance(val, oimParam):
+                val = val(wl, t)
+            res = self.op(res, val)
+        return res
 
 
 class oimParamNorm:
@@ -231,10 +389,12 @@ class oimParamNorm:
         return self.params.unit
 
     def __call__(self, wl=None, t=None):
+        return _evaluate(self, self._call, wl, t)
 
+    def _call(self, wl, t):
         res = self.norm
         for p in self.params:
-            res -= p(wl, t)
+            res = res - p(wl, t)
         return res
 
 
@@ -297,7 +457,7 @@ class oimParamInterpolator(oimParam):
         return 0
 
     def __call__(self, wl=None, t=None):
-        return self._interpFunction(wl, t)
+        return _evaluate(self, self._interpFunction, wl, t, unique=True)
 
     def _getParams(self):
         pass
@@ -321,7 +481,7 @@ class oimParamInterpolator(oimParam):
         for pi in params:
             for key, value in kwargs.items():
                 try:
-                    pi.__dict__[key] = value
+                    setattr(pi, key, value)
                 except NameError:
                     print("Not valid parameter : {}".format(value))
 
@@ -373,14 +533,30 @@ class oimParamInterpolatorKeyframes(oimParamInterpolator):
             )
             self.keyvalues.append(pi)
 
-    def _interpFunction(self, wl, t):
-        if self.dependence == "wl":
-            var = wl
-        else:
-            var = t
+        self._interpolant = None
+        self._unique = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_interpolant"] = None
+        state["_unique"] = None
+        return state
+
+    def _getInterpolant(self):
+        """Return the interpolant, rebuilding it only if a keyframe, a
+        keyvalue or an option changed since the last call."""
         values = np.array([pi() for pi in self.keyvalues])
         keyframes = np.array([pi() for pi in self.keyframes])
 
+        cache = getattr(self, "_interpolant", None)
+        if (
+            cache is not None
+            and cache[0] == (self.kind, self.extrapolate)
+            and np.array_equal(cache[1], keyframes)
+            and np.array_equal(cache[2], values)
+        ):
+            return cache[3]
+
         if self.extrapolate:
             fill_value = "extrapolate"
             bounds_error = None
@@ -388,13 +564,51 @@ class oimParamInterpolatorKeyframes(oimParamInterpolator):
             fill_value = (values[0], values[-1])
             bounds_error = False
 
-        return interp1d(
+        interpolant = interp1d(
             keyframes,
             values,
             fill_value=fill_value,
             kind=self.kind,
             bounds_error=bounds_error,
-        )(var)
+        )
+        self._interpolant = (
+            (self.kind, self.extrapolate),
+            keyframes,
+            values,
+            interpolant,
+        )
+        return interpolant
+
+    def _getUnique(self, var):
+        """Return the unique values of var and the indices to broadcast them
+        back to its shape.
+
+        NOTE: As for the cached complex coherent flux of the components, the
+        var array is compared by identity so that arrays modified in place
+        are not detected.
+        """
+        cache = getattr(self, "_unique", None)
+        if cache is not None and cache[0] is var:
+            return cache[1], cache[2]
+
+        unique, inverse = np.unique(var, return_inverse=True)
+        self._unique = (var, unique, inverse.reshape(np.shape(var)))
+        return self._unique[1], self._unique[2]
+
+    def _interpFunction(self, wl, t):
+        if self.dependence == "wl":
+            var = wl
+        else:
+            var = t
+
+        interpolant = self._getInterpolant()
+        if var is None:
+            return interpolant(var)
+
+        # NOTE: Data wavelengths and times are repeated for all baselines
+        # so that the interpolation is only done on their unique values
+        unique, inverse = self._getUnique(var)
+        return interpolant(unique)[inverse]
 
     def _getParams(self):
         params = []
@@ -623,7 +837,7 @@ class oimParamMultipleGaussian(oimParamInterpolator):
             var = t
         val = self.val0()
         for i in range(len(self.x0)):
-            val += (self.values[i]() - self.val0()) * np.exp(
+            val = val + (self.values[i]() - self.val0()) * np.exp(
                 -2.77 * (var - self.x0[i]()) ** 2 / self.fwhm[i]() ** 2
             )
         return val
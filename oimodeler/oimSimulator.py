@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 """Data/model simulation"""
+from collections import OrderedDict
+
 import astropy.units as u
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.optimize import least_squares
 
 from .oimData import oimData, oimDataType
+from .oimParam import oimParamInterpolator
 from .oimPlots import (
     _errorplot,
     oimPlotParamArr,
@@ -18,21 +22,16 @@ from .oimUtils import hdulistDeepCopy
 
 
 def corrFlux2Vis2(vcompl):
-    nB = vcompl.shape[0]
-    norm = np.outer(np.ones(nB - 1), vcompl[0, :])
-    return np.abs(vcompl[1:, :] / norm) ** 2
+    return np.abs(vcompl[1:, :] / vcompl[0, :]) ** 2
 
 
 def corrFlux2VisAmpAbs(vcompl):
-    nB = vcompl.shape[0]
-    norm = np.outer(np.ones(nB - 1), vcompl[0, :])
-    return np.abs(vcompl[1:, :] / norm)
+    return np.abs(vcompl[1:, :] / vcompl[0, :])
 
 
 # FIXME : Not real formula for differential visibilities
 def corrFlux2VisAmpDif(vcompl):
-    nlam = vcompl.shape[1]
-    norm = np.outer(np.mean(vcompl[1:, :], axis=1), np.ones(nlam))
+    norm = np.mean(vcompl[1:, :], axis=1, keepdims=True)
     return np.abs(vcompl[1:, :] / norm)
 
 
@@ -46,53 +45,197 @@ def corrFlux2VisPhiAbs(vcompl):
 
 # FIXME : Not real formula for differential phases
 def corrFlux2VisPhiDif(vcompl):
-    nlam = vcompl.shape[1]
-    norm = np.outer(np.mean(vcompl[1:, :], axis=1), np.ones(nlam))
+    norm = np.mean(vcompl[1:, :], axis=1, keepdims=True)
     return np.angle(vcompl[1:, :] * np.conjugate(norm), deg=True)
 
 
-# TODO: Special function doing T3Amp and T3Phi simultaneously
-def corrFlux2T3Amp(vcompl):
-    nB = vcompl.shape[0]
-    nCP = (nB - 1) // 3
-    norm = np.outer(np.ones(nCP), vcompl[0, :])
-    BS = (
+def corrFlux2Bispectrum(vcompl):
+    nCP = (vcompl.shape[0] - 1) // 3
+    return (
         vcompl[1 : nCP + 1, :]
         * vcompl[nCP + 1 : 2 * nCP + 1, :]
         * np.conjugate(vcompl[2 * nCP + 1 :, :])
-        / norm**3
+        / vcompl[0, :] ** 3
     )
-    return np.abs(BS)
+
+
+def corrFlux2T3(vcompl):
+    BS = corrFlux2Bispectrum(vcompl)
+    return np.abs(BS), np.angle(BS, deg=True)
+
+
+def corrFlux2T3Amp(vcompl):
+    return np.abs(corrFlux2Bispectrum(vcompl))
 
 
 def corrFlux2T3Phi(vcompl):
-    nB = vcompl.shape[0]
-    nCP = (nB - 1) // 3
-    norm = np.outer(np.ones(nCP), vcompl[0, :])
-    BS = (
-        vcompl[1 : nCP + 1, :]
-        * vcompl[nCP + 1 : 2 * nCP + 1, :]
-        * np.conjugate(vcompl[2 * nCP + 1 :, :])
-        / norm**3
-    )
-    return np.angle(BS, deg=True)
+    return np.angle(corrFlux2Bispectrum(vcompl), deg=True)
 
 
 def corrFlux2Flux(vcompl):
     return np.abs(vcompl)
 
 
+def corrFlux2Observables(vcompl, plan):
+    """Compute all the observables of an oimObservablePlan from the complex
+    coherent fluxes.
+
+    For each kernel of the plan, the complex quantity (normalized visibility,
+    coherent flux, visibility relative to its mean or bispectrum) is computed
+    once and all the observables (amplitudes, squared amplitudes and phases)
+    are derived from it.
+
+    Parameters
+    ----------
+    vcompl : numpy.ndarray
+        The complex coherent fluxes computed at the oimData.vect_u,
+        vect_v... coordinates. The last axis is the one of the coordinates.
+    plan : oimObservablePlan
+        The plan of the observables of the oimData.
+
+    Returns
+    -------
+    val : numpy.ndarray
+        The simulated observables in the order of the plan.
+    """
+    phases = (
+        oimDataType.VISPHI_ABS | oimDataType.VISPHI_DIF | oimDataType.T3PHI
+    )
+    val = np.zeros(vcompl.shape[:-1] + (plan.size,))
+    for kernel, gather in plan.gather.items():
+        vcompl1 = vcompl[..., gather["idx1"]]
+        if kernel == "VIS":
+            vis = vcompl1 / vcompl[..., gather["idxNorm"]]
+        elif kernel == "CORR":
+            vis = vcompl1
+        elif kernel == "DIF":
+            mean = np.add.reduceat(vcompl1, gather["groupStart"], axis=-1)
+            mean = np.repeat(
+                mean / gather["groupSize"], gather["groupSize"], axis=-1
+            )
+            vis = vcompl1 / mean
+        else:
+            vis = (
+                vcompl1
+                * vcompl[..., gather["idx2"]]
+                * np.conjugate(vcompl[..., gather["idx3"]])
+                / vcompl[..., gather["idxNorm"]] ** 3
+            )
+
+        # NOTE: Amplitudes and phases are computed once for all the
+        # observables of the kernel
+        codes = list(gather["outputs"])
+        if any(not code & phases for code in codes):
+            amp = np.abs(vis)
+        if any(code & phases for code in codes):
+            if kernel == "DIF":
+                phi = np.angle(vcompl1 * np.conjugate(mean), deg=True)
+            else:
+                phi = np.angle(vis, deg=True)
+
+        for dataType, (sel, pos) in gather["outputs"].items():
+            if dataType == oimDataType.VIS2DATA:
+                val[..., pos] = amp[..., sel] ** 2
+            elif dataType & phases:
+                val[..., pos] = phi[..., sel]
+            else:
+                val[..., pos] = amp[..., sel]
+    return val
+
+
+def observables2Chi2(val, plan, dataTypes, residuals=False):
+    """Compute the chi2 of simulated observables against the observed ones.
+
+    Only the constants precomputed in the plan (values and weights of the
+    valid observables, phasors of the observed phases) are used so that no
+    astropy table is accessed.
+
+    Parameters
+    ----------
+    val : numpy.ndarray
+        The simulated observables in the order of the plan (for instance as
+        returned by corrFlux2Observables).
+    plan : oimObservablePlan
+        The plan of the observables of the oimData.
+    dataTypes : list of str
+        The names of the quantities to include in the chi2.
+    residuals : bool, optional
+        If True, also return the residual vector. The default is False.
+
+    Returns
+    -------
+    chi2 : float
+        The chi2.
+    nelChi2 : int
+        The number of observables used in the chi2.
+    res : numpy.ndarray
+        The residuals (data-model)/err for all the observables of the plan,
+        with the phases wrapped on the circle and zero for flagged or invalid
+        data. Only returned if residuals is True.
+    """
+    res = plan.validVal - val
+    # NOTE: For phase quantities go to the complex plane
+    phaseIndex = plan.phaseIndex
+    res[..., phaseIndex] = np.rad2deg(
+        np.angle(plan.phasor * np.exp(-1j * np.deg2rad(val[..., phaseIndex])))
+    )
+    # NOTE: The weights are zero for flagged or invalid data
+    res *= plan.weight
+
+    mask = plan.getChi2Mask(dataTypes)
+    chi2 = res**2 @ mask
+    if not np.all(np.isfinite(chi2)):
+        # NOTE: Only needed for NaN or infinite simulated observables
+        res = np.nan_to_num(res, nan=0)
+        chi2 = np.nan_to_num(res**2) @ mask
+    nelChi2 = plan.getNelChi2(dataTypes)
+    if residuals:
+        return chi2, nelChi2, res
+    return chi2, nelChi2
+
+
+_defaultDataTypes = [
+    "VIS2DATA",
+    "VISAMP",
+    "VISPHI",
+    "T3AMP",
+    "T3PHI",
+    "FLUXDATA",
+]
+
+
 class oimSimulator:
     """Contains"""
 
     def __init__(
-        self, data=None, model=None, fitter=None, cprior=None, **kwargs
+        self,
+        data=None,
+        model=None,
+        fitter=None,
+        cprior=None,
+        cacheSize=0,
+        linearParams=None,
+        **kwargs,
     ):
         self.data = oimData()
-        self.simulatedData = None
+        self.simulatedObservables = None
+        self._simulatedData = None
+        self._simulatedDataPlan = None
+        self._simulatedDataReady = False
         self.model = None
         self.cprior = cprior
 
+        # NOTE: Opt-in LRU cache of the results of compute/computeResiduals
+        self.cacheSize = cacheSize
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self._cache = OrderedDict()
+        self._cachePlan = None
+
+        # NOTE: Flux parameters solved at each computation instead of being
+        # explored by the fitters
+        self.linearParams = list(linearParams or [])
+
         if data != None:
             if isinstance(data, oimData):
                 self.data = data
@@ -107,17 +250,277 @@ class oimSimulator:
                 computeChi2=True, computeSimulatedData=True, cprior=self.cprior
             )
 
+    def __getstate__(self):
+        """Return the state of the simulator for pickling.
+
+        The astropy tables of the data cannot be pickled. Only the observable
+        plan and the unique coordinates of the data are kept so that a
+        simulator sent to another process (for instance to parallelize a
+        fitter) can compute the chi2 and the residuals, but not the simulated
+        data tables.
+        """
+        state = self.__dict__.copy()
+        data = oimData()
+        for key in [
+            "plan",
+            "unique_u",
+            "unique_v",
+            "unique_wl",
+            "unique_dwl",
+            "unique_mjd",
+            "unique_inverse",
+        ]:
+            setattr(data, key, getattr(self.data, key))
+        state["data"] = data
+        state.pop("vcompl", None)
+        state.pop("chi2List", None)
+        state["simulatedObservables"] = None
+        state["_simulatedData"] = None
+        state["_simulatedDataPlan"] = None
+        state["_cache"] = OrderedDict()
+        state["_cachePlan"] = None
+        return state
+
     def setModel(self, model):
         self.model = model
 
+    def getFreeParameters(self):
+        """Return the free parameters of the model that are not solved as
+        linear parameters, i.e. the ones explored by the fitters.
+
+        Returns
+        -------
+        dict
+            The free parameters as returned by model.getFreeParameters()
+            without the linearParams.
+        """
+        return {
+            key: parami
+            for key, parami in self.model.getFreeParameters().items()
+            if not any(parami is paramj for paramj in self.linearParams)
+        }
+
+    def getFreeVector(self):
+        """Return the values of the free parameters explored by the fitters
+        as a vector in the order of getFreeParameters()."""
+        if not self.linearParams:
+            return self.model.getFreeVector()
+        return np.array(
+            [parami.value for parami in self.getFreeParameters().values()],
+            dtype=float,
+        )
+
+    def setFreeVector(self, theta):
+        """Set the values of the free parameters explored by the fitters from
+        a vector in the order of getFreeParameters().
+
+        Parameters
+        ----------
+        theta : array_like
+            The values of the free parameters.
+        """
+        if not self.linearParams:
+            self.model.setFreeVector(theta)
+            return
+        for parami, thetai in zip(self.getFreeParameters().values(), theta):
+            parami.value = thetai
+
     def addData(self, data):
         self.data.addData(data)
 
     def prepareData(self):
         self.data.prepareData()
-        self.simulatedData = oimData()
-        for datai in self.data.data:
-            self.simulatedData.addData(hdulistDeepCopy(datai))
+        self.simulatedObservables = None
+        self._simulatedData = None
+
+    @property
+    def simulatedData(self):
+        """The simulated data as an oimData object.
+
+        The simulated observables are stored as a flat vector
+        (simulatedObservables) aligned with the observable plan of the data.
+        They are only written into the astropy tables when this property is
+        accessed. The tables are copied from the data once and reused for all
+        subsequent calls. The copy is not prepared, its tables are directly
+        filled using the observable plan of the data.
+        """
+        if self.simulatedObservables is None:
+            return self._simulatedData
+
+        if self._simulatedData is None:
+            self._simulatedData = oimData()
+            self._simulatedData.addData(
+                [hdulistDeepCopy(datai) for datai in self.data.data],
+                prepare=False,
+            )
+            self._simulatedDataPlan = self.data.plan
+            self._simulatedDataReady = False
+
+        if not self._simulatedDataReady:
+            self._fillSimulatedData()
+        return self._simulatedData
+
+    @simulatedData.setter
+    def simulatedData(self, value):
+        self._simulatedData = value
+        self._simulatedDataPlan = self.data.plan
+        self._simulatedDataReady = True
+
+    def _fillSimulatedData(self):
+        """Fill the simulated data tables with the simulated observables."""
+        val, plan = self.simulatedObservables, self.data.plan
+        for ifile, arrNum, name, start, stop, nrows, nwl in plan.blocks:
+            vali = np.reshape(val[start:stop], (nrows, nwl))
+            try:
+                self._simulatedData.data[ifile][arrNum].data[name] = vali
+            except:
+                self._simulatedData.data[ifile][arrNum].data[name] = (
+                    np.squeeze(vali)
+                )
+        self._simulatedDataReady = True
+
+    def clearCache(self):
+        """Clear the cache of results and reset the hit/miss counters."""
+        self._cache.clear()
+        self._cachePlan = None
+        self.cacheHits = 0
+        self.cacheMisses = 0
+
+    def _computeObservables(self, dataTypes):
+        """Compute the complex coherent flux, the simulated observables, the
+        chi2 and the residuals of the model.
+
+        If cacheSize is greater than zero, the results are stored in a
+        bounded LRU cache keyed by the values of the parameters of the model,
+        the dataTypes and the prepared data, so that repeated evaluations of
+        the same model are not computed again.
+
+        Returns
+        -------
+        vcompl, val, chi2, nelChi2, res
+            The complex coherent flux, the observables in the order of the
+            plan, the chi2, the number of observables used in the chi2 and
+            the residuals as returned by observables2Chi2.
+        """
+        plan = self.data.plan
+        if self.linearParams:
+            # NOTE: Not cached as the values of the linear parameters are
+            # outputs of the computation
+            vcompl = self._solveLinearParams(dataTypes)
+            val = corrFlux2Observables(vcompl, plan)
+            return (vcompl, val) + observables2Chi2(
+                val, plan, dataTypes, residuals=True
+            )
+
+        if not self.cacheSize:
+            vcompl = self._computeComplexCoherentFlux()
+            val = corrFlux2Observables(vcompl, plan)
+            return (vcompl, val) + observables2Chi2(
+                val, plan, dataTypes, residuals=True
+            )
+
+        # NOTE: The cache is invalidated when the data are prepared again
+        if self._cachePlan is not plan:
+            self._cache.clear()
+            self._cachePlan = plan
+
+        key = (
+            tuple(c.getFingerprint() for c in self.model.components),
+            tuple(dataTypes),
+        )
+        results = self._cache.get(key)
+        if results is not None:
+            self._cache.move_to_end(key)
+            self.cacheHits += 1
+            return results
+
+        self.cacheMisses += 1
+        vcompl = self._computeComplexCoherentFlux()
+        val = corrFlux2Observables(vcompl, plan)
+        results = (vcompl, val) + observables2Chi2(
+            val, plan, dataTypes, residuals=True
+        )
+        self._cache[key] = results
+        while len(self._cache) > self.cacheSize:
+            self._cache.popitem(last=False)
+        return results
+
+    def _computeFluxBasis(self):
+        """Compute the complex coherent flux of the model with all the linear
+        parameters set to zero and, for each linear parameter, the change of
+        the complex coherent flux when this parameter is set to one.
+
+        The fluxes may depend on the linear parameters through normalizers
+        or linkers (e.g. after oimModel.normalizeFlux) as long as this
+        dependence is affine.
+
+        Returns
+        -------
+        vcompl0 : numpy.ndarray
+            The complex coherent flux for null linear parameters.
+        basis : numpy.ndarray
+            The (nlinear, n) complex coherent fluxes for unit fluxes.
+        """
+        values0 = [parami.value for parami in self.linearParams]
+        basis = []
+        try:
+            for parami in self.linearParams:
+                parami.value = 0
+            vcompl0 = self._computeComplexCoherentFlux()
+            for parami in self.linearParams:
+                parami.value = 1
+                basis.append(self._computeComplexCoherentFlux() - vcompl0)
+                parami.value = 0
+        finally:
+            for parami, valuei in zip(self.linearParams, values0):
+                parami.value = valuei
+
+        return vcompl0, np.array(basis).reshape(-1, vcompl0.size)
+
+    def _solveLinearParams(self, dataTypes):
+        """Solve the values of the linear (flux) parameters.
+
+        The complex coherent flux of the model is linear in the fluxes of its
+        components. The model is computed once with null linear parameters
+        and once per unit linear parameter, and the fluxes minimizing the
+        chi2 (within the min and max of the parameters) are found by a
+        bounded least-squares in which each evaluation is only a linear
+        combination of the precomputed complex coherent fluxes. The linear
+        parameters are set to the solution.
+
+        Returns
+        -------
+        vcompl : numpy.ndarray
+            The complex coherent flux of the model for the solved fluxes.
+        """
+        vcompl0, basis = self._computeFluxBasis()
+        plan = self.data.plan
+        mask = plan.getMask(dataTypes)
+
+        def residuals(fluxes):
+            val = corrFlux2Observables(vcompl0 + fluxes @ basis, plan)
+            res = observables2Chi2(val, plan, dataTypes, residuals=True)[2]
+            return res[mask]
+
+        lower = np.array([parami.min for parami in self.linearParams], float)
+        upper = np.array([parami.max for parami in self.linearParams], float)
+        x0 = np.clip([p.value for p in self.linearParams], lower, upper)
+        fluxes = least_squares(residuals, x0, bounds=(lower, upper)).x
+
+        for parami, fluxi in zip(self.linearParams, fluxes):
+            parami.value = fluxi
+        return vcompl0 + fluxes @ basis
+
+    def _computeComplexCoherentFlux(self):
+        """Compute the complex coherent flux of the model on the unique
+        coordinates of the data and scatter it back to the vect_* ones."""
+        vcompl = self.model.getComplexCoherentFlux(
+            self.data.unique_u,
+            self.data.unique_v,
+            self.data.unique_wl,
+            self.data.unique_mjd,
+        )
+        return vcompl[..., self.data.unique_inverse]
 
     def compute(
         self,
@@ -128,156 +531,49 @@ class oimSimulator:
         cprior=None,
     ):
         if dataTypes is None:
-            dataTypes = [
-                "VIS2DATA",
-                "VISAMP",
-                "VISPHI",
-                "T3AMP",
-                "T3PHI",
-                "FLUXDATA",
-            ]
-
-        self.vcompl = self.model.getComplexCoherentFlux(
-            self.data.vect_u,
-            self.data.vect_v,
-            self.data.vect_wl,
-            self.data.vect_mjd,
-        )
+            dataTypes = _defaultDataTypes
 
         nelChi2 = 0
         chi2 = 0
         chi2List = []
 
-        if computeSimulatedData == True and (
-            checkSimulatedData == True or self.simulatedData == None
-        ):
-            self.simulatedData = oimData()
-            for datai in self.data.data:
-                self.simulatedData.addData(hdulistDeepCopy(datai))
+        plan = self.data.plan
 
-        data = self.data
+        # NOTE: The simulated data tables are recreated (lazily) only if the
+        # data were prepared again
+        if (
+            computeSimulatedData == True
+            and checkSimulatedData == True
+            and self._simulatedDataPlan is not plan
+        ):
+            self._simulatedData = None
 
         if (computeChi2 == True) | (computeSimulatedData == True):
-            idx = 0
-            nfiles = len(data.struct_u)
-            for ifile in range(nfiles):
-                narr = len(data.struct_arrType[ifile])
-                for iarr in range(narr):
-                    arrNum = data.struct_arrNum[ifile][iarr]
-                    arrType = data.struct_arrType[ifile][iarr]
-                    dataType = data.struct_dataType[ifile][iarr]
-                    nB = data.struct_nB[ifile][iarr]
-                    nwl = data.struct_nwl[ifile][iarr]
-                    vcompli = self.vcompl[idx : idx + nB * nwl]
-                    vcompli = np.reshape(vcompli, [nB, nwl])
-
-                    dataVal = data.struct_val[ifile][iarr]
-                    dataErr = data.struct_err[ifile][iarr]
-                    flag = data.struct_flag[ifile][iarr]
-
-                    idx += nB * nwl
-                    quantities = []
-                    val = []
-
-                    # NOTE: Computing all observables from complex Coherent Flux
-                    if arrType == "OI_VIS2":
-                        val.append(corrFlux2Vis2(vcompli))
-                        quantities.append("VIS2DATA")
-
-                    elif arrType == "OI_VIS":
-                        if dataType & oimDataType.VISAMP_ABS:
-                            val.append(corrFlux2VisAmpAbs(vcompli))
-                            quantities.append("VISAMP")
-                        elif dataType & oimDataType.VISAMP_DIF:
-                            val.append(corrFlux2VisAmpDif(vcompli))
-                            quantities.append("VISAMP")
-                        elif dataType & oimDataType.VISAMP_COR:
-                            val.append(corrFlux2VisAmpCor(vcompli))
-                            quantities.append("VISAMP")
-
-                        if dataType & oimDataType.VISPHI_ABS:
-                            val.append(corrFlux2VisPhiAbs(vcompli))
-                            quantities.append("VISPHI")
-                        elif dataType & oimDataType.VISPHI_DIF:
-                            val.append(corrFlux2VisPhiDif(vcompli))
-                            quantities.append("VISPHI")
-
-                    elif arrType == "OI_T3":
-                        if dataType & oimDataType.T3AMP:
-                            val.append(corrFlux2T3Amp(vcompli))
-                            quantities.append("T3AMP")
-                        if dataType & oimDataType.T3PHI:
-                            val.append(corrFlux2T3Phi(vcompli))
-                            quantities.append("T3PHI")
-
-                    elif arrType == "OI_FLUX":
-                        val.append(corrFlux2Flux(vcompli))
-                        # Fucking GRAVITY patch!
-                        if "FLUXDATA" in [
-                            c.name
-                            for c in data.data[ifile][arrNum].data.columns
-                        ]:
-                            quantities.append("FLUXDATA")
-                        else:
-                            quantities.append("FLUX")
-
-                    # NOTE: Filling the simulatedData astropy array with the computed values
-                    if computeSimulatedData:
-                        for ival in range(len(val)):
-                            try:
-                                self.simulatedData.data[ifile][arrNum].data[
-                                    quantities[ival]
-                                ] = val[ival]
-                            except:
-                                self.simulatedData.data[ifile][arrNum].data[
-                                    quantities[ival]
-                                ] = np.squeeze(val[ival])
-
-                    # NOTE: Computing the chi2
-                    if computeChi2 == True:
-                        for ival in range(len(val)):
-
-                            if nwl == 1 and len(dataVal[ival].shape) == 1:
-                                dataVal[ival] = dataVal[ival][:, None]
-                                dataErr[ival] = dataErr[ival][:, None]
-                                flag[ival] = flag[ival][:, None]
-
-                            # NOTE: For phase quantities go to the complex plane
-                            if quantities[ival] in dataTypes:
-                                if quantities[ival] in ["VISPHI", "T3PHI"]:
-                                    dphi = np.rad2deg(
-                                        np.angle(
-                                            np.exp(
-                                                1j * np.deg2rad(dataVal[ival])
-                                            )
-                                            * np.exp(
-                                                -1j * np.deg2rad((val[ival]))
-                                            )
-                                        )
-                                    )
-                                    chi2i = (
-                                        dphi
-                                        * np.logical_not(flag[ival])
-                                        / dataErr[ival]
-                                    ) ** 2
-                                else:
-                                    chi2i = (
-                                        (dataVal[ival] - val[ival])
-                                        * np.logical_not(flag[ival])
-                                        / dataErr[ival]
-                                    ) ** 2
-
-                                nelChi2 += np.sum(
-                                    (dataErr[ival] != 0)
-                                    * np.logical_not(flag[ival])
-                                )
-                                chi2 += np.sum(np.nan_to_num(chi2i, nan=0))
+            # NOTE: Computing all observables from complex Coherent Flux
+            self.vcompl, val, chi2, nelChi2, res = self._computeObservables(
+                dataTypes
+            )
+
+            # NOTE: The simulatedData astropy arrays are only filled with the
+            # computed values when accessed
+            if computeSimulatedData:
+                self.simulatedObservables = val
+                self._simulatedDataReady = False
+
+            # NOTE: Building the list of chi2 arrays
+            if computeChi2 == True:
+                chi2i = res**2
+                for _, _, name, start, stop, nrows, nwl in plan.blocks:
+                    if name in dataTypes:
+                        chi2List.append(
+                            np.reshape(chi2i[start:stop], (nrows, nwl))
+                        )
+        else:
+            self.vcompl = self._computeComplexCoherentFlux()
 
-                                chi2List.append(chi2i)
-                                # print(chi2i)
         if computeChi2 and self.cprior is None:
             self.chi2 = chi2
-            self.chi2r = chi2 / (nelChi2 - len(self.model.getFreeParameters()))
+            self.chi2r = chi2 / (nelChi2 - self.model.getNFree())
             self.chi2List = chi2List
             self.nelChi2 = nelChi2
         elif computeChi2:
@@ -286,17 +582,145 @@ class oimSimulator:
             )
             self.chi2 = chi2_prior
             self.chi2r = chi2_prior / (
-                nelChi2 - len(self.model.getFreeParameters())
+                nelChi2 - self.model.getNFree()
             )
 
             self.chi2_np = chi2
             self.chi2r_np = chi2 / (
-                nelChi2 - len(self.model.getFreeParameters())
+                nelChi2 - self.model.getNFree()
             )
 
             self.chi2List = chi2List
             self.nelChi2 = nelChi2
 
+    def computeResiduals(self, theta=None, dataTypes=None):
+        """Compute the weighted residual vector of the model.
+
+        Parameters
+        ----------
+        theta : array_like, optional
+            The values of the free parameters of the model in the order of
+            getFreeParameters(). If None, the current values are used.
+        dataTypes : list of str, optional
+            The names of the quantities to include. The default is all.
+
+        Returns
+        -------
+        res : numpy.ndarray
+            The residuals (data-model)/err of all the observables of the
+            given dataTypes, with phases wrapped on the circle and zero for
+            flagged or invalid data. If a cprior is set, its contribution is
+            appended as an additional residual so that the sum of the squared
+            residuals equals the chi2.
+        """
+        if dataTypes is None:
+            dataTypes = _defaultDataTypes
+
+        if theta is not None:
+            self.setFreeVector(theta)
+
+        plan = self.data.plan
+        self.vcompl, val, chi2, nelChi2, res = self._computeObservables(
+            dataTypes
+        )
+        res = res[plan.getMask(dataTypes)]
+
+        if self.cprior is not None:
+            prior = self.cprior(self.model.getParameters()) * nelChi2
+            res = np.append(res, np.sqrt(np.maximum(prior, 0)))
+        return res
+
+    def _isBatchable(self, freeParams):
+        """Check if the model can be computed for many parameter vectors at
+        once by setting the free parameters values to (N, 1) arrays."""
+        if self.cprior is not None or self.linearParams:
+            return False
+
+        interpParams = []
+        for component in self.model.components:
+            if not component.batchable:
+                return False
+            for param in component.params.values():
+                if isinstance(param, oimParamInterpolator):
+                    interpParams.extend(param.params)
+
+        return not any(
+            parami is interpj
+            for parami in freeParams
+            for interpj in interpParams
+        )
+
+    def computeBatch(
+        self, thetas, dataTypes=None, chunkSize=None, params=None
+    ):
+        """Compute the chi2 for many vectors of free parameters.
+
+        For models made of components defined in the Fourier plane the free
+        parameters are set to arrays of shape (N, 1) so that all the models
+        are computed in a single vectorized pass. Otherwise, the models are
+        computed one by one. The values of the free parameters are restored
+        at the end.
+
+        Parameters
+        ----------
+        thetas : array_like
+            The values of the free parameters as an (N, nfree) array in the
+            order of getFreeParameters() (or of params if given).
+        dataTypes : list of str, optional
+            The names of the quantities to include. The default is all.
+        chunkSize : int, optional
+            The maximum number of models computed at once to limit the
+            memory usage. The default is None (all at once).
+        params : list of oimParam, optional
+            The parameters set to the values of thetas. The default is None
+            (the free parameters of the model).
+
+        Returns
+        -------
+        chi2 : numpy.ndarray
+            The N values of the chi2.
+        """
+        if dataTypes is None:
+            dataTypes = _defaultDataTypes
+
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=float))
+        if params is None:
+            freeParams = list(self.getFreeParameters().values())
+        else:
+            freeParams = list(params)
+        values0 = [parami.value for parami in freeParams]
+        plan = self.data.plan
+        chi2 = np.zeros(thetas.shape[0])
+
+        try:
+            if not self._isBatchable(freeParams):
+                for i, theta in enumerate(thetas):
+                    for parami, thetai in zip(freeParams, theta):
+                        parami.value = thetai
+                    self.compute(computeChi2=True, dataTypes=dataTypes)
+                    chi2[i] = self.chi2
+                return chi2
+
+            if chunkSize is None:
+                chunkSize = thetas.shape[0]
+
+            for start in range(0, thetas.shape[0], chunkSize):
+                thetasi = thetas[start : start + chunkSize]
+                for iparam, parami in enumerate(freeParams):
+                    parami.value = thetasi[:, iparam, None]
+                vcompl = self._computeComplexCoherentFlux()
+                vcompl = np.broadcast_to(
+                    vcompl, (thetasi.shape[0], vcompl.shape[-1])
+                )
+                val = corrFlux2Observables(vcompl, plan)
+                chi2[start : start + chunkSize] = observables2Chi2(
+                    val, plan, dataTypes
+                )[0]
+        finally:
+            for parami, valuei in zip(freeParams, values0):
+                parami.value = valuei
+        return chi2
+
     def computeAll(self, checkSimulatedData=True, dataTypes=None, cprior=None):
         self.compute(
             computeChi2=True,
@@ -388,12 +388,46 @@ def compare_angles(phi: float, psi: float) -> float:
     return diff
 
 
+# NOTE: Number of wavelength (or frequency) grids kept by the caches
+_gridCacheSize = 16
+
+
+def _gridKey(grid: ArrayLike) -> Tuple:
+    """Return a hashable key for the content of an array.
+
+    NOTE: The content is used rather than the identity, as the grids are
+    often recomputed (e.g. nu = c / wl) at each call.
+    """
+    grid = np.asarray(grid)
+    return grid.shape, grid.dtype.str, grid.tobytes()
+
+
+def _gridCached(cache: Dict, key: Any, function: Any) -> Any:
+    """Return cache[key], computing it with function() if needed and keeping
+    only the _gridCacheSize most recently used keys."""
+    if key in cache:
+        value = cache.pop(key)
+    else:
+        value = function()
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        if len(cache) >= _gridCacheSize:
+            cache.pop(next(iter(cache)))
+    cache[key] = value
+    return value
+
+
+_planckGrids = {}
+
+
 def blackbody(
     temperature: float,
     nu: Union[float, ArrayLike, None] = None,
 ) -> np.ndarray:
     """Planck's law in CGS.
 
+    The temperature-independent terms are cached for each frequency grid.
+
     Parameters
     ----------
     temperature : float or numpy.typing.ArrayLike
@@ -406,9 +440,16 @@ def blackbody(
     blackbody : np.ndarray
         The blackbody (erg / (cm² s Hz sr)).
     """
-    factor = 2 * const.cgs.h * nu**3 / const.cgs.c**2
-    num = np.exp(const.cgs.h * nu / (const.cgs.kB * temperature)) - 1
-    return factor / num
+    key = _gridKey(nu)
+    factor, hnu_k = _gridCached(
+        _planckGrids,
+        key,
+        lambda: (
+            2 * const.cgs.h * nu**3 / const.cgs.c**2,
+            const.cgs.h * nu / const.cgs.kB,
+        ),
+    )
+    return factor / (np.exp(hnu_k / temperature) - 1)
 
 
 # TODO: Remove astropy from here
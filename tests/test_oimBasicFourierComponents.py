@@ -196,3 +196,58 @@ def test_oimConvolutor_visFunction(
     conv = oimFComp.oimConvolutor(ring, gauss)
     conv_vis = conv.getComplexCoherentFlux(spfu, spfv)
     assert np.array_equal(conv_vis, manual_conv_vis)
+
+
+@pytest.mark.parametrize(
+    "component",
+    [
+        oimFComp.oimUD(d=20),
+        oimFComp.oimIRing(d=20),
+        oimFComp.oimRing(din=10, dout=20),
+        oimFComp.oimRing2(d=20, w=5),
+        oimFComp.oimLinearLDD(d=20, a=0.3),
+        oimFComp.oimQuadLDD(d=20, a1=0.3, a2=0.2),
+        oimFComp.oimSqrtLDD(d=20, a1=0.3, a2=0.2),
+        oimFComp.oim4CLDD(d=20, a1=0.3, a2=0.2, a3=0.1, a4=0.1),
+    ],
+)
+def test_besselOptions(
+    uvcoord: ArrayLike, component, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the unique and table options of the Bessel kernels."""
+    spfu, spfv = np.array(uvcoord) / 3.5e-6
+    vis = component.getComplexCoherentFlux(spfu, spfv)
+
+    bessel = oimFComp.oimOptions.model.bessel
+    monkeypatch.setattr(bessel, "unique", True)
+    assert np.allclose(
+        component.getComplexCoherentFlux(spfu, spfv), vis, rtol=0, atol=1e-14
+    )
+
+    # NOTE: The error of each normalized term is lower than the tolerance
+    monkeypatch.setattr(bessel, "table", True)
+    vis_table = component.getComplexCoherentFlux(spfu, spfv)
+    assert np.allclose(vis_table, vis, rtol=0, atol=20 * bessel.tolerance)
+
+
+@pytest.mark.parametrize(
+    "component",
+    [
+        oimFComp.oimPt(x=1, f=2),
+        oimFComp.oimUD(d=5, f=2, A_V=1),
+        oimFComp.oimEGauss(fwhm=3, elong=2, pa=30, f=2),
+        oimFComp.oimConvolutor(
+            oimFComp.oimUD(d=4), oimFComp.oimEGauss(fwhm=2, elong=2, pa=30),
+            f=2
+        ),
+    ],
+)
+def test_getImage(component) -> None:
+    """Test that the flux of the image matches the zero frequency flux."""
+    wl, t = np.linspace(3e-6, 4e-6, 3), [0, 1]
+    image = component.getImage(64, 0.3, wl, t)
+    flux = component.getComplexCoherentFlux(
+        np.zeros(3), np.zeros(3), wl, np.zeros(3)
+    )
+    assert image.shape == (2, 3, 64, 64)
+    assert np.allclose(image.sum(axis=(-2, -1)), flux.real)
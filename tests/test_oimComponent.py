@@ -78,3 +78,98 @@ def test_oimComponent_getImage(component: oimComponent) -> None:
     image = component.getImage(dim=512, pixSize=0.1)
     assert image.size == 512**2
     assert np.array_equal(image, np.zeros((512, 512)))
+
+
+def test_oimComponent_getCachedComplexCoherentFlux(monkeypatch) -> None:
+    """Tests that the complex coherent flux is only recomputed when the
+    parameters or the coordinates change."""
+    from oimodeler.oimBasicFourierComponents import oimUD
+
+    ud = oimUD(d=3, f=oimInterp("wl", wl=[1e-6, 2e-6], values=[1, 2]))
+    ncalls = []
+    getComplexCoherentFlux = ud.getComplexCoherentFlux
+    monkeypatch.setattr(
+        ud,
+        "getComplexCoherentFlux",
+        lambda *args: ncalls.append(1) or getComplexCoherentFlux(*args),
+    )
+
+    u, v = np.linspace(0, 1e7, 10), np.zeros(10)
+    wl = np.full(10, 1.5e-6)
+    vc = ud.getCachedComplexCoherentFlux(u, v, wl)
+    assert ud.getCachedComplexCoherentFlux(u, v, wl) is vc
+    assert len(ncalls) == 1
+
+    ud.params["f"].params[1].value = 3
+    vc2 = ud.getCachedComplexCoherentFlux(u, v, wl)
+    assert len(ncalls) == 2
+    assert np.allclose(vc2, vc * 2 / 1.5)
+
+    ud.getCachedComplexCoherentFlux(u.copy(), v, wl)
+    assert len(ncalls) == 3
+
+    ud.clearCache()
+    ud.getCachedComplexCoherentFlux(u, v, wl)
+    assert len(ncalls) == 4
+
+    # NOTE: The configuration of the interpolators is part of the cache key
+    ud.params["f"].kind = "nearest"
+    ud.getCachedComplexCoherentFlux(u, v, wl)
+    assert len(ncalls) == 5
+
+
+def test_oimComponent_cacheable() -> None:
+    """Tests that the components depending on attributes that are not in the
+    fingerprint are not cached, and that the cache is not pickled."""
+    import pickle
+
+    from oimodeler.oimBasicFourierComponents import oimUD
+    from oimodeler.oimComponent import oimComponentFourier
+    from oimodeler.oimModel import oimModel
+
+    class ScaledUD(oimUD):
+        def _visFunction(self, xp, yp, rho, wl, t):
+            return super()._visFunction(xp * self.scale, yp, rho, wl, t)
+
+    class Scaled(oimComponentFourier):
+        def _visFunction(self, xp, yp, rho, wl, t):
+            return np.cos(xp * self.scale * 1e-7)
+
+    assert oimUD.cacheable and not ScaledUD.cacheable
+    assert not Scaled.cacheable
+
+    c = Scaled()
+    c.scale = 1
+    m = oimModel(c)
+    u, v = np.linspace(0, 1e7, 10), np.zeros(10)
+    wl = np.full(10, 1.5e-6)
+    vc = m.getComplexCoherentFlux(u, v, wl)
+    c.scale = 3
+    assert not np.allclose(m.getComplexCoherentFlux(u, v, wl), vc)
+
+    ud = oimUD(d=3)
+    ud.getCachedComplexCoherentFlux(u, v, wl)
+    assert ud._cache is not None
+    assert pickle.loads(pickle.dumps(ud))._cache is None
+
+
+def test_oimComponentRadialProfile_cache() -> None:
+    """Tests that setting the radial grid clears the cache."""
+    from oimodeler.oimComponent import oimComponentRadialProfile
+
+    class Ring(oimComponentRadialProfile):
+        cacheable = True
+
+        def _radialProfileFunction(self, r=None, wl=None, t=None):
+            return ((r > 1) & (r < 2)).astype(float)
+
+    c = Ring(dim=64)
+    c._r = np.linspace(0, 5, 64)
+    u, v = np.linspace(0, 1e8, 10), np.zeros(10)
+    wl = np.full(10, 1.5e-6)
+    vc = c.getCachedComplexCoherentFlux(u, v, wl)
+    assert c.getCachedComplexCoherentFlux(u, v, wl) is vc
+
+    c._r = np.linspace(0, 1.5, 64)
+    assert c._cache is None
+    assert not np.allclose(c.getCachedComplexCoherentFlux(u, v, wl), vc)
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from oimodeler import oimCustomComponents as oimCComp
+from oimodeler.oimParam import oimInterp
+
+
+@pytest.mark.parametrize(
+    "cls", [oimCComp.oimStarHaloGaussLorentz, oimCComp.oimStarHaloIRing]
+)
+def test_oimStarHalo_getImage_chromatic(cls) -> None:
+    """Test that a chromatic star flux is added to each wavelength plane."""
+    wl = np.array([1e-6, 1.5e-6, 2e-6])
+    fs = oimInterp("wl", wl=[1e-6, 2e-6], values=[0.3, 0.6])
+    image = cls(fs=fs, fc=0.4, la=0.3, elong=1.5, pa=30).getImage(64, 0.1, wl)
+    assert image.shape == (1, 3, 64, 64)
+
+    for i, wli in enumerate(wl):
+        fsi = np.interp(wli, [1e-6, 2e-6], [0.3, 0.6])
+        imagei = cls(fs=fsi, fc=0.4, la=0.3, elong=1.5, pa=30).getImage(
+            64, 0.1, wli
+        )
+        assert np.allclose(image[0, i], imagei)
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy as np
 from astropy.io import fits
 
 import oimodeler as oim
@@ -68,5 +69,59 @@ def test_oimData_prepareData() -> None:
     ...
 
 
+def test_oimData_uniqueCoordinates(global_data_dir: Path) -> None:
+    """Tests the unique coordinates built by oimData.prepareData."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    data = oim.oimData(files)
+    assert data.unique_u.size < data.vect_u.size
+    for name in ["u", "v", "wl", "dwl", "mjd"]:
+        unique = getattr(data, f"unique_{name}")
+        vect = getattr(data, f"vect_{name}")
+        assert np.array_equal(unique[data.unique_inverse], vect)
+
+
+def test_oimObservablePlan(global_data_dir: Path) -> None:
+    """Tests the flat observable plan built by oimData.prepareData."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    data = oim.oimData(files)
+    plan = data.plan
+
+    nval = sum(
+        np.size(vali)
+        for vals in data.struct_val
+        for val in vals
+        for vali in val
+    )
+    assert plan.size == nval
+    assert plan.val.shape == plan.err.shape == plan.flag.shape == (nval,)
+    assert plan.blocks[-1][4] == nval
+
+    mask = plan.getMask(["VIS2DATA"])
+    assert np.all(plan.dataType[mask] == oim.oimDataType.VIS2DATA)
+    assert np.all(plan.isPhase == plan.getMask(["VISPHI", "T3PHI"]))
+
+    vis = plan.gather["VIS"]
+    assert np.all(data.vect_u[vis["idxNorm"]] == 0)
+    assert np.all(data.vect_u[vis["idx1"]] != 0)
+
+    # NOTE: T3AMP and T3PHI share the same bispectrum points
+    t3 = plan.gather["T3"]
+    selAmp, posAmp = t3["outputs"][oim.oimDataType.T3AMP]
+    selPhi, posPhi = t3["outputs"][oim.oimDataType.T3PHI]
+    assert np.array_equal(selAmp, selPhi)
+    assert t3["idx1"].size == posAmp.size == posPhi.size
+
+    # NOTE: Flagged data have a null weight
+    data.data[0]["OI_VIS2"].data["FLAG"][0, :] = True
+    data.prepareData()
+    plan = data.plan
+    assert np.all(plan.weight[plan.flag] == 0)
+    assert np.all(plan.weight[plan.valid] == plan.invErr[plan.valid])
+    assert plan.getNelChi2(["VIS2DATA"]) == np.sum(plan.valid & mask)
+    assert plan.phasor.size == np.sum(plan.isPhase)
+
+    assert oim.oimData().plan.size == 0
+
+
 def test_oimData_writeto() -> None:
     ...
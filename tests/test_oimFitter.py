@@ -1,3 +1,7 @@
+import multiprocessing
+from pathlib import Path
+
+import numpy as np
 import pytest
 
 import oimodeler as oim
@@ -75,14 +79,6 @@ def test_oimFitterDynesty_run() -> None:
     ...
 
 
-def test_oimFitterDynesty_ptform() -> None:
-    ...
-
-
-def test_oimFitterDynesty_logProbability() -> None:
-    ...
-
-
 def test_oimFitterDynesty_getResults() -> None:
     ...
 
@@ -113,3 +109,197 @@ def test_oimFitterMinimize_run() -> None:
 
 def test_oimFitterMinimize_getResults() -> None:
     ...
+
+
+def test_oimFitterLeastSquares_run(real_data_dir: Path) -> None:
+    """Tests the least-squares fitter against the minimize one."""
+    files = sorted((real_data_dir / "PIONIER" / "canopus").glob("PION*.fits"))
+    dataTypes = ["VIS2DATA", "T3PHI"]
+    results = []
+    for fitterClass in [oim.oimFitterMinimize, oim.oimFitterLeastSquares]:
+        model = oim.oimModel(oim.oimPowerLawLDD(d=8, a=0))
+        model.normalizeFlux()
+        fitter = fitterClass(files, model, dataTypes=dataTypes)
+        fitter.prepare()
+        fitter.run()
+        results.append(fitter.getResults()[0])
+
+    res = fitter.simulator.computeResiduals(dataTypes=dataTypes)
+    assert np.isclose(np.sum(res**2), fitter.simulator.chi2)
+    assert np.allclose(results[0], results[1], rtol=1e-3)
+    assert fitter.res.nfev < 50
+
+
+def test_oimFitterEmcee_pool(global_data_dir: Path) -> None:
+    """Tests that the parallel emcee sampler gives the serial chain."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    chains = []
+    for nproc in [None, 2]:
+        model = oim.oimModel(oim.oimUD(d=3))
+        model.components[0].params["d"].set(min=0, max=20, free=True)
+        fitter = oim.oimFitterEmcee(files, model, nwalkers=8)
+        np.random.seed(1)
+        fitter.prepare(init="random", nproc=nproc)
+        fitter.run(nsteps=5)
+        chains.append(fitter.sampler.get_chain())
+    assert np.allclose(chains[0], chains[1])
+
+
+def test_oimFitterEmcee_vectorize(global_data_dir: Path) -> None:
+    """Tests that the vectorized emcee sampler gives the serial chain."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    chains = []
+    for vectorize in [False, True]:
+        model = oim.oimModel(oim.oimUD(d=3, f=0.8), oim.oimGauss(fwhm=2))
+        model.components[0].params["d"].set(min=0, max=20, free=True)
+        model.components[1].params["fwhm"].set(min=0, max=10, free=True)
+        fitter = oim.oimFitterEmcee(files, model, nwalkers=8)
+        np.random.seed(1)
+        fitter.prepare(init="random", vectorize=vectorize)
+        fitter.run(nsteps=5)
+        chains.append(fitter.sampler.get_chain())
+    assert np.allclose(chains[0], chains[1])
+
+    # NOTE: The batched log-probability is not evaluated by a pool
+    with pytest.raises(ValueError):
+        fitter.prepare(init="random", vectorize=True, nproc=2)
+
+
+@pytest.mark.parametrize("nproc", [None, 2])
+def test_oimFitterRegularGrid_run(
+    global_data_dir: Path, tmp_path: Path, nproc
+) -> None:
+    """Tests the chunked regular grid against node-by-node computations."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    ud = oim.oimUD(d=3, f=0.8)
+    gauss = oim.oimGauss(fwhm=2)
+    model = oim.oimModel(ud, gauss)
+    params = [ud.params["d"], gauss.params["fwhm"]]
+    fitter = oim.oimFitterRegularGrid(files, model)
+    fitter.prepare(params=params, min=[1, 1], max=[10, 5], steps=[1, 0.5])
+
+    mapFile = tmp_path / "chi2rMap.npy"
+    fitter.run(chunkSize=7, nproc=nproc, mapFile=mapFile, progress=False)
+    chi2rMap = np.array(fitter.chi2rMap)
+    assert chi2rMap.shape == (10, 9)
+
+    for igrid in [(0, 0), (3, 5), (9, 8)]:
+        for parami, gridi, idx in zip(params, fitter.grid, igrid):
+            parami.value = gridi[idx]
+        fitter.simulator.compute(computeChi2=True)
+        assert np.isclose(chi2rMap[igrid], fitter.simulator.chi2r)
+
+    # NOTE: Only the missing nodes are computed when resuming
+    fitter.chi2rMap[2:4, :] = np.nan
+    fitter.chi2rMap.flush()
+    fitter.run(mapFile=mapFile, resume=True, progress=False)
+    assert np.allclose(fitter.chi2rMap, chi2rMap)
+    assert fitter.getResults() == [
+        gridi[idx]
+        for gridi, idx in zip(
+            fitter.grid, np.unravel_index(np.argmin(chi2rMap), (10, 9))
+        )
+    ]
+
+
+def test_oimFitterAdaptiveGrid_run(global_data_dir: Path) -> None:
+    """Tests that the adaptive grid finds the minimum of the regular one."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    results = []
+    for fitterClass in [oim.oimFitterRegularGrid, oim.oimFitterAdaptiveGrid]:
+        ud = oim.oimUD(d=3, f=0.8)
+        gauss = oim.oimGauss(fwhm=2)
+        fitter = fitterClass(files, oim.oimModel(ud, gauss))
+        fitter.prepare(
+            params=[ud.params["d"], gauss.params["fwhm"]],
+            min=[1, 1],
+            max=[20, 10],
+            steps=[0.25, 0.25],
+        )
+        fitter.run(progress=False)
+        results.append(fitter.getResults())
+
+    assert results[0] == results[1]
+    assert fitter.chi2rMap.shape == fitter.chi2rMapSparse.shape == (77, 37)
+    assert not np.any(np.isnan(fitter.chi2rMap))
+    assert fitter.nComputed < fitter.chi2rMap.size / 4
+
+
+def test_oimFitterEmcee_resume(global_data_dir: Path, tmp_path: Path) -> None:
+    """Tests that an emcee run saved in a compressed file is resumed."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    samplerFile = tmp_path / "sampler.h5"
+    model = oim.oimModel(oim.oimUD(d=3))
+    model.components[0].params["d"].set(min=0, max=20, free=True)
+    for resume, niter in [(True, 5), (True, 10), (False, 5)]:
+        fitter = oim.oimFitterEmcee(files, model, nwalkers=8)
+        fitter.prepare(
+            init="random",
+            samplerFile=samplerFile,
+            compression="gzip",
+            resume=resume,
+        )
+        fitter.run(nsteps=5)
+        assert fitter.sampler.iteration == niter
+
+
+def test_oimFitterDynesty_resume(
+    global_data_dir: Path, tmp_path: Path
+) -> None:
+    """Tests that a checkpointed dynesty run is restored and continued."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    samplerFile = tmp_path / "sampler.save"
+    model = oim.oimModel(oim.oimUD(d=3))
+    model.components[0].params["d"].set(min=0, max=20, free=True)
+    model.components[0].params["f"].free = False
+    fitter = oim.oimFitterDynesty(files, model, method="static")
+    fitter.prepare(nlive=30, samplerFile=samplerFile, checkpointEvery=0)
+    # NOTE: Without the final live points, as a run that was interrupted
+    fitter.run(maxiter=50, add_live=False)
+    assert samplerFile.exists()
+
+    fitter = oim.oimFitterDynesty(files, model, method="static")
+    fitter.prepare(nlive=30, samplerFile=samplerFile, resume=True)
+    niter = fitter.sampler.it
+    assert niter > 50
+    fitter.run(maxiter=100)
+    assert fitter.sampler.it > niter + 50
+    assert 0 < fitter.getResults()[0][0] < 20
+
+
+def test_oimFitterDynesty_nproc(global_data_dir: Path) -> None:
+    """Tests the dynesty sampler with a pool of processes."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    model = oim.oimModel(oim.oimUD(d=3))
+    model.components[0].params["d"].set(min=0, max=20, free=True)
+    model.components[0].params["f"].free = False
+    fitter = oim.oimFitterDynesty(files, model, method="static")
+
+    # NOTE: The pool only exists during the run
+    fitter.prepare(nlive=30, nproc=2)
+    fitter.prepare(nlive=30, nproc=2)
+    assert not multiprocessing.active_children()
+    fitter.run(dlogz=1)
+    assert not multiprocessing.active_children()
+    assert fitter.sampler.pool is None
+    assert 0 < fitter.getResults()[0][0] < 20
+
+
+@pytest.mark.parametrize(
+    "init,nproc", [("random", None), ("lhs", 2), ("grid", None)]
+)
+def test_oimFitterMultiStart_run(global_data_dir: Path, init, nproc) -> None:
+    """Tests the ranking of the solutions of the multi-start fitter."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    model = oim.oimModel(oim.oimUD(d=3))
+    model.components[0].params["d"].set(min=0, max=20, free=True)
+    model.components[0].params["f"].free = False
+    fitter = oim.oimFitterMultiStart(files, model, nstarts=4)
+    fitter.prepare(init=init)
+    assert fitter.initialParams.shape == (4, 1)
+    assert np.all((fitter.initialParams > 0) & (fitter.initialParams < 20))
+
+    fitter.run(nproc=nproc, progress=False)
+    assert np.all(np.diff(fitter.solutionsChi2r) >= 0)
+    assert np.isclose(fitter.simulator.chi2r, fitter.solutionsChi2r[0])
+    assert fitter.getResults()[0][0] == fitter.solutions[0, 0]
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import oimodeler as oim
@@ -11,16 +12,115 @@ def test_getComplexCoherentFlux():
     ...
 
 
+def test_parameterEvaluation():
+    wl = np.linspace(3e-6, 4e-6, 5)
+    ud = oim.oimUD(d=oim.oimInterp("wl", wl=[3e-6, 4e-6], values=[2, 4]))
+    pt = oim.oimPt()
+    pt.params["x"] = oim.oimParamLinker(ud.params["d"], "mul", 0.5)
+    model = oim.oimModel(ud, pt)
+    model.normalizeFlux()
+
+    ncalls = []
+    interpFunction = ud.params["d"]._interpFunction
+
+    def countedInterpFunction(wl, t):
+        ncalls.append(1)
+        return interpFunction(wl, t)
+
+    ud.params["d"]._interpFunction = countedInterpFunction
+    u, v = np.full(5, 20.0), np.zeros(5)
+    vc = model.getComplexCoherentFlux(u, v, wl)
+    assert len(ncalls) == 1
+
+    # NOTE: Outside of a model evaluation the values are not cached
+    ud.params["d"]._interpFunction = interpFunction
+    expected = ud.getComplexCoherentFlux(u, v, wl) + pt.getComplexCoherentFlux(
+        u, v, wl
+    )
+    assert np.allclose(vc, expected)
+
+
 def test_getParameters():
-    ...
+    ud = oim.oimUD(d=3, f=0.5)
+    pt = oim.oimPt(f=0.5)
+    pt.params["f"] = ud.params["f"]
+    model = oim.oimModel(ud, pt)
+    params = model.getParameters()
+    assert list(params) == [
+        "c1_UD_x", "c1_UD_y", "c1_UD_f", "c1_UD_d", "c2_Pt_x", "c2_Pt_y"
+    ]
+    assert params["c1_UD_f"] is ud.params["f"]
 
 
 def test_getFreeParameters():
-    ...
+    ud = oim.oimUD(d=3, f=0.5)
+    model = oim.oimModel(ud)
+    assert list(model.getFreeParameters()) == ["c1_UD_f", "c1_UD_d"]
+
+    # NOTE: The cached registry follows changes of the free flags
+    ud.params["x"].free = True
+    assert list(model.getFreeParameters()) == [
+        "c1_UD_x", "c1_UD_f", "c1_UD_d"
+    ]
+    ud.params["d"] = oim.oimParamLinker(ud.params["f"], "mul", 2)
+    assert list(model.getFreeParameters()) == ["c1_UD_x", "c1_UD_f"]
+
+
+def test_freeVector():
+    ud = oim.oimUD(d=3, f=0.5)
+    model = oim.oimModel(ud)
+    assert np.allclose(model.getFreeVector(), [0.5, 3])
+    model.setFreeVector([0.2, 7])
+    assert ud.params["f"].value == 0.2
+    assert ud.params["d"].value == 7
+    assert model.getNFree() == 2
+    with pytest.raises(ValueError):
+        model.setFreeVector([1, 2, 3])
+
+
+def test_registry():
+    ud = oim.oimUD(d=3, f=oim.oimInterp("wl", wl=[3e-6, 4e-6], values=[1, 2]))
+    components = [ud]
+    model = oim.oimModel(components)
+    registry = model._getRegistry()
+    assert model.getNFree() == 3
+
+    # NOTE: The registry is only rebuilt after a structural change
+    model.setFreeVector([1, 2, 4])
+    assert model._getRegistry() is registry
+
+    ud.params["f"].params[0].free = False
+    assert model.getNFree() == 2
+    ud.params["x"].set(free=True)
+    assert model.getNFree() == 3
+    ud.params["d"] = oim.oimParamLinker(ud.params["x"], "mul", 2)
+    assert model.getNFree() == 2
+    components.append(oim.oimPt(f=0.5))
+    assert model.getNFree() == 3
 
 
 def test_getImage():
-    ...
+    ud = oim.oimUD(d=oim.oimInterp("wl", wl=[3e-6, 4e-6], values=[2, 4]))
+    eg = oim.oimEGauss(fwhm=2, elong=2, pa=30, f=oim.oimInterp(
+        "wl", wl=[3e-6, 4e-6], values=[1, 3]))
+    model = oim.oimModel(ud, eg)
+    wl, t = np.linspace(3e-6, 4e-6, 3), [0, 1]
+
+    image = model.getImage(64, 0.2, wl, t)
+    assert image.shape == (2, 3, 64, 64)
+    assert image.dtype == float
+    assert np.allclose(image.sum(axis=(-2, -1)), [[2, 3, 4]] * 2)
+
+    image32 = model.getImage(64, 0.2, wl, t, dtype=np.float32)
+    assert image32.dtype == np.float32
+    assert np.allclose(image32, image, atol=1e-6)
+
+    image = model.getImage(64, 0.2, wl, t, normalize=True)
+    assert np.allclose(image.max(axis=(-2, -1)), 1)
+
+    # NOTE: The components do not keep the complex coherent flux of the grid
+    model.getImage(64, 0.2, wl, t, fromFT=True)
+    assert ud._cache is None and eg._cache is None
 
 
 def test_saveImage():
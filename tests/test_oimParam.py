@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.interpolate import interp1d
+
+import oimodeler as oim
+
+
+def test_oimParamInterpolatorKeyframes():
+    ud = oim.oimUD(
+        d=oim.oimInterp("wl", wl=[3e-6, 3.5e-6, 4e-6], values=[2, 5, 3])
+    )
+    param = ud.params["d"]
+    wl = np.tile(np.linspace(2.8e-6, 4.2e-6, 7), (3, 1))
+
+    expected = interp1d(
+        [3e-6, 3.5e-6, 4e-6], [2, 5, 3], bounds_error=False, fill_value=(2, 3)
+    )(wl)
+    assert np.allclose(param(wl), expected)
+    assert param(wl).shape == wl.shape
+
+    # NOTE: The interpolant is only rebuilt when a keyvalue changes
+    interpolant = param._interpolant[3]
+    param(wl)
+    assert param._interpolant[3] is interpolant
+    param.keyvalues[1].value = 1
+    assert np.isclose(param(3.5e-6), 1)
+    assert param._interpolant[3] is not interpolant
+
+
+def test_oimParamEvaluation():
+    param = oim.oimUD(
+        d=oim.oimInterp("powerlawWl", x0=3e-6, A=2, p=1.5)
+    ).params["d"]
+    wl = np.repeat(np.linspace(3e-6, 4e-6, 4), 5)
+    t = np.zeros_like(wl)
+
+    sizes = []
+    interpFunction = param._interpFunction
+
+    def countedInterpFunction(wl, t):
+        sizes.append(np.size(wl))
+        return interpFunction(wl, t)
+
+    param._interpFunction = countedInterpFunction
+    with oim.oimParamEvaluation(wl, t):
+        value = param(wl, t)
+        assert param(wl, t) is value
+    assert sizes == [4]
+    assert np.allclose(value, 2 * (wl / 3e-6) ** 1.5)
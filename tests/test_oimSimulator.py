@@ -1,3 +1,6 @@
+from pathlib import Path
+
+import numpy as np
 import pytest
 
 import oimodeler as oim
@@ -39,6 +42,77 @@ def test_corrFlux2Flux() -> None:
     ...
 
 
+def test_corrFlux2T3() -> None:
+    """Tests the fused computation of the closure amplitudes and phases."""
+    rng = np.random.default_rng(0)
+    vcompl = rng.normal(size=(7, 5)) + 1j * rng.normal(size=(7, 5))
+    t3amp, t3phi = oim.corrFlux2T3(vcompl)
+    assert t3amp.shape == t3phi.shape == (2, 5)
+    assert np.allclose(t3amp, oim.corrFlux2T3Amp(vcompl))
+    assert np.allclose(t3phi, oim.corrFlux2T3Phi(vcompl))
+
+    bs = vcompl[1:3] * vcompl[3:5] * np.conjugate(vcompl[5:]) / vcompl[0] ** 3
+    assert np.allclose(t3amp * np.exp(1j * np.deg2rad(t3phi)), bs)
+
+
+def test_corrFlux2Observables(global_data_dir: Path) -> None:
+    """Tests that the vectorized observables match the per-array ones."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    data = oim.oimData(files)
+    model = oim.oimModel(oim.oimUD(d=3, f=0.6, x=1), oim.oimGauss(fwhm=5))
+    vcompl = model.getComplexCoherentFlux(
+        data.vect_u, data.vect_v, data.vect_wl, data.vect_mjd
+    )
+    val = oim.corrFlux2Observables(vcompl, data.plan)
+    assert val.shape == (data.plan.size,)
+
+    functions = {
+        oim.oimDataType.VIS2DATA: oim.corrFlux2Vis2,
+        oim.oimDataType.VISAMP_ABS: oim.corrFlux2VisAmpAbs,
+        oim.oimDataType.VISPHI_DIF: oim.corrFlux2VisPhiDif,
+        oim.oimDataType.T3AMP: oim.corrFlux2T3Amp,
+        oim.oimDataType.T3PHI: oim.corrFlux2T3Phi,
+    }
+    offsets = {}
+    idx = 0
+    for ifile, arrNums in enumerate(data.struct_arrNum):
+        for iarr, arrNum in enumerate(arrNums):
+            offsets[(ifile, arrNum)] = idx
+            idx += data.struct_u[ifile][iarr].size
+
+    for ifile, arrNum, name, start, stop, nrows, nwl in data.plan.blocks:
+        idx = offsets[(ifile, arrNum)]
+        nB = nrows * 3 + 1 if name.startswith("T3") else nrows + 1
+        vcompli = np.reshape(vcompl[idx : idx + nB * nwl], (nB, nwl))
+        expected = functions[data.plan.dataType[start]](vcompli)
+        assert np.allclose(
+            val[start:stop].reshape(nrows, nwl), expected, equal_nan=True
+        )
+
+
+def test_observables2Chi2(global_data_dir: Path) -> None:
+    """Tests the chi2 kernel working on the observable plan buffers."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    model = oim.oimModel(oim.oimUD(d=3, f=0.6, x=1), oim.oimGauss(fwhm=5))
+    sim = oim.oimSimulator(files, model)
+    plan = sim.data.plan
+    dataTypes = ["VIS2DATA", "T3PHI"]
+
+    chi2, nelChi2 = oim.observables2Chi2(plan.val.copy(), plan, dataTypes)
+    assert np.isclose(chi2, 0)
+    assert nelChi2 == plan.getNelChi2(dataTypes)
+
+    sim.compute(computeChi2=True, dataTypes=dataTypes)
+    val = oim.corrFlux2Observables(sim.vcompl, plan)
+    chi2, nelChi2, res = oim.observables2Chi2(
+        val, plan, dataTypes, residuals=True
+    )
+    assert np.isclose(chi2, sim.chi2)
+    assert nelChi2 == sim.nelChi2
+    assert res.shape == (plan.size,)
+    assert np.all(np.abs(res[plan.isPhase]) <= 180 * plan.invErr[plan.isPhase])
+
+
 def test_oimSimulator_init() -> None:
     ...
 
@@ -59,9 +133,161 @@ def test_oimSimulator_compute() -> None:
     ...
 
 
+def test_oimSimulator_simulatedData(
+    global_data_dir: Path, monkeypatch
+) -> None:
+    """Tests the lazy filling of the simulated data."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    ud = oim.oimUD(d=3)
+    sim = oim.oimSimulator(files, oim.oimModel(ud))
+    assert sim.simulatedObservables.shape == (sim.data.plan.size,)
+
+    # NOTE: The copied tables are filled without preparing them
+    prepared = []
+    monkeypatch.setattr(
+        oim.oimData,
+        "prepareData",
+        lambda self: prepared.append(len(self.data)),
+    )
+    simulatedData = sim.simulatedData
+    monkeypatch.undo()
+    assert not any(prepared)
+    vis2 = simulatedData.data[0]["OI_VIS2"].data["VIS2DATA"].copy()
+
+    ud.params["d"].value = 10
+    sim.compute(computeSimulatedData=True)
+    assert sim.simulatedData is simulatedData
+    assert np.all(simulatedData.data[0]["OI_VIS2"].data["VIS2DATA"] < vis2)
+    assert not np.allclose(sim.data.data[0]["OI_VIS2"].data["VIS2DATA"], vis2)
+
+    sim.prepareData()
+    sim.compute(computeSimulatedData=True)
+    assert sim.simulatedData is not simulatedData
+
+
+@pytest.mark.parametrize("interp", [False, True])
+def test_oimSimulator_computeBatch(global_data_dir: Path, interp) -> None:
+    """Tests that the batched chi2 match the one-by-one computation."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    if interp:
+        fwhm = oim.oimInterp("wl", wl=[3e-6, 4e-6], values=[2, 8])
+    else:
+        fwhm = 5
+    ud = oim.oimUD(d=3, f=0.6, x=1.5)
+    eg = oim.oimEGauss(fwhm=fwhm, elong=1.5, pa=30, f=0.4)
+    model = oim.oimModel(ud, eg, oim.oimBackground(f=0.1))
+    sim = oim.oimSimulator(files, model)
+
+    freeParams = model.getFreeParameters()
+    values0 = [parami.value for parami in freeParams.values()]
+    thetas = np.array(values0) * np.linspace(0.5, 1.5, 7)[:, None]
+    chi2 = sim.computeBatch(thetas, chunkSize=3)
+    assert chi2.shape == (7,)
+    assert [parami.value for parami in freeParams.values()] == values0
+
+    for theta, chi2i in zip(thetas, chi2):
+        for parami, thetai in zip(freeParams.values(), theta):
+            parami.value = thetai
+        sim.compute(computeChi2=True)
+        assert np.isclose(sim.chi2, chi2i)
+
+
 def test_oimSimulator_plotWlTemplate() -> None:
     ...
 
 
 def test_oimSimulator_plot() -> None:
     ...
+
+
+def test_oimSimulator_cache(global_data_dir: Path) -> None:
+    """Tests the LRU cache of the results of the simulator."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    ud = oim.oimUD(d=3)
+    sim = oim.oimSimulator(files, oim.oimModel(ud), cacheSize=2)
+    chi2 = sim.chi2
+    assert (sim.cacheHits, sim.cacheMisses) == (0, 1)
+
+    sim.compute(computeChi2=True)
+    assert sim.chi2 == chi2
+    assert (sim.cacheHits, sim.cacheMisses) == (1, 1)
+
+    for d in [5, 10, 3]:
+        ud.params["d"].value = d
+        sim.compute(computeChi2=True)
+    assert sim.chi2 == chi2
+    assert len(sim._cache) == 2
+    assert (sim.cacheHits, sim.cacheMisses) == (1, 4)
+
+    sim.compute(computeChi2=True, dataTypes=["VIS2DATA"])
+    assert sim.cacheMisses == 5
+
+    sim.prepareData()
+    sim.compute(computeChi2=True)
+    assert sim.cacheMisses == 6
+
+    sim.clearCache()
+    assert (sim.cacheHits, sim.cacheMisses) == (0, 0)
+
+
+def test_oimSimulator_cache_interpolator(global_data_dir: Path) -> None:
+    """Tests that a change of the kind of an interpolator is a cache miss."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    wl = np.linspace(3e-6, 4e-6, 4)
+    ud = oim.oimUD(d=oim.oimInterp("wl", wl=wl, values=[3, 8, 4, 9]))
+    sim = oim.oimSimulator(files, oim.oimModel(ud), cacheSize=4)
+    chi2 = sim.chi2
+
+    ud.params["d"].kind = "cubic"
+    sim.compute(computeChi2=True)
+    assert (sim.cacheHits, sim.cacheMisses) == (0, 2)
+    assert sim.chi2 != chi2
+
+    ud.params["d"].kind = "linear"
+    sim.compute(computeChi2=True)
+    assert sim.cacheHits == 1
+    assert sim.chi2 == chi2
+
+
+def test_oimSimulator_linearParams(global_data_dir: Path) -> None:
+    """Tests that the linear flux parameters are solved at each compute."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    ud = oim.oimUD(d=8, f=1)
+    pt = oim.oimPt(f=0.5)
+    flux = pt.params["f"]
+    sim = oim.oimSimulator(files, oim.oimModel(ud, pt), linearParams=[flux])
+    assert "c2_Pt_f" not in sim.getFreeParameters()
+    assert "c1_UD_d" in sim.getFreeParameters()
+
+    chi2, solution = sim.chi2, flux.value
+    assert flux.min < solution < flux.max
+
+    # NOTE: The solved flux is a minimum of the chi2
+    sim.linearParams = []
+    for delta in [-0.01, 0.01]:
+        flux.value = solution + delta
+        sim.compute(computeChi2=True)
+        assert sim.chi2 > chi2
+
+
+def test_oimSimulator_linearParams_normalizeFlux(
+    global_data_dir: Path,
+) -> None:
+    """Tests the linear parameters of a model with normalized fluxes."""
+    files = sorted((global_data_dir / "ASPRO_MATISSE").glob("*.fits"))
+    ud = oim.oimUD(d=8, f=0.5)
+    pt = oim.oimPt()
+    model = oim.oimModel(ud, pt)
+    model.normalizeFlux()
+    flux = ud.params["f"]
+    sim = oim.oimSimulator(files, model, linearParams=[flux])
+    chi2, solution = sim.chi2, flux.value
+
+    # NOTE: The chi2 is the one of the model at the solved flux
+    sim.linearParams = []
+    sim.compute(computeChi2=True)
+    assert np.isclose(sim.chi2, chi2)
+    for delta in [-0.01, 0.01]:
+        flux.value = solution + delta
+        sim.compute(computeChi2=True)
+        assert sim.chi2 > chi2
@@ -1,6 +1,9 @@
+import numpy as np
 import pytest
 
 import oimodeler as oim
+from oimodeler.oimExtinction import extlaw_FitzIndeb
+from oimodeler.oimOptions import constants as const
 
 
 def test_getDataTypeIsAnalysisComplex() -> None:
@@ -18,7 +21,28 @@ def test_getDataTypeError() -> None:
     ...
 
 def test_blackbody() -> None:
-    ...
+    nu = const.c / np.linspace(3e-6, 4e-6, 10)
+    expected = (
+        2 * const.cgs.h * nu**3 / const.cgs.c**2
+        / (np.exp(const.cgs.h * nu / (const.cgs.kB * 3000)) - 1)
+    )
+    assert np.allclose(oim.blackbody(3000, nu), expected, rtol=1e-12)
+
+    # NOTE: Only the temperature-independent terms are cached, the result
+    # can be modified in place
+    bb = oim.blackbody(3000, nu.copy())
+    bb *= 2
+    assert np.allclose(oim.blackbody(3000, nu), expected, rtol=1e-12)
+    temperatures = np.array([[3000], [5000]])
+    assert np.allclose(
+        oim.blackbody(temperatures, nu)[0], expected, rtol=1e-12
+    )
+
+
+def test_extlaw_FitzIndeb() -> None:
+    wl = np.linspace(3e-6, 4e-6, 10)
+    kappa = extlaw_FitzIndeb(wl, 1)
+    assert np.allclose(extlaw_FitzIndeb(wl.copy(), 2.5), 2.5 * kappa)
 
 
 def test_compute_intensity() -> None: